@@ -0,0 +1,43 @@
+from collections import namedtuple
+from enum import IntEnum
+
+
+class Facing(IntEnum):
+    LEFT = 0
+    RIGHT = 1
+    UP = 2
+    DOWN = 3
+
+
+class Action(IntEnum):
+    IDLE = 0
+    WALKING = 1
+    ATTACKING = 2
+    DAMAGED = 3
+    DEAD = 4
+
+
+FACINGS = tuple(Facing)
+ACTIONS = tuple(Action)
+
+Animation = namedtuple("Animation", ["name", "frames", "masks", "flashes"])
+
+
+def parse_folder(name):
+    # "left_attacking" -> (LEFT, ATTACKING), a bare "left" is the walk cycle
+    # and "damaged" / "dead" have no direction so they serve every facing
+    facing, _, action = name.partition("_")
+    if facing.upper() in Facing.__members__:
+        return [Facing[facing.upper()]], Action[(action or "walking").upper()]
+    return list(FACINGS), Action[name.upper()]
+
+
+def build_frame_table(animations, masks, flashes):
+    # table[facing][action] -> Animation, None where the folder does not exist
+    table = [[None] * len(ACTIONS) for _ in FACINGS]
+    for name, frames in animations.items():
+        facings, action = parse_folder(name)
+        animation = Animation(name, frames, masks[name], flashes[name])
+        for facing in facings:
+            table[facing][action] = animation
+    return table
@@ -0,0 +1,141 @@
+import pygame
+from atlas import load_atlas
+from animation import build_frame_table
+
+
+class AssetCache:
+    def __init__(self):
+        self.atlases = {}
+        self.animation_sets = {}
+        self.mask_sets = {}
+        self.flash_sets = {}
+        self.frame_tables = {}
+        self.sounds = {}
+        self.sizes = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, store, key):
+        if key in store:
+            self.hits += 1
+            return store[key]
+
+        self.misses += 1
+        return None
+
+    def animations(self, path):
+        animations = self.lookup(self.animation_sets, path)
+        if animations is None:
+            animations = self.load_animations(path)
+            self.animation_sets[path] = animations
+        return animations
+
+    def masks(self, path):
+        masks = self.lookup(self.mask_sets, path)
+        if masks is None:
+            masks = {
+                status: [pygame.mask.from_surface(surf) for surf in frames]
+                for status, frames in self.animations(path).items()
+            }
+            self.mask_sets[path] = masks
+            self.sizes[("masks", path)] = sum(
+                mask_bytes(mask) for frames in masks.values() for mask in frames
+            )
+        return masks
+
+    def flashes(self, path):
+        flashes = self.lookup(self.flash_sets, path)
+        if flashes is None:
+            flashes = {
+                status: [flash_surface(mask) for mask in frames]
+                for status, frames in self.masks(path).items()
+            }
+            self.flash_sets[path] = flashes
+            self.sizes[("flashes", path)] = sum(
+                surface_bytes(surf) for frames in flashes.values() for surf in frames
+            )
+        return flashes
+
+    def frame_table(self, path):
+        table = self.lookup(self.frame_tables, path)
+        if table is None:
+            table = build_frame_table(
+                self.animations(path), self.masks(path), self.flashes(path)
+            )
+            self.frame_tables[path] = table
+        return table
+
+    def sound(self, path, volume=1.0):
+        key = (path, volume)
+        sound = self.lookup(self.sounds, key)
+        if sound is None:
+            sound = pygame.mixer.Sound(path)
+            sound.set_volume(volume)
+            self.sounds[key] = sound
+            self.sizes[("sound", key)] = sound.get_length() * sound_bytes_per_second()
+        return sound
+
+    def load_animations(self, path):
+        # every frame is a subsurface of one atlas, so a folder is a single decode
+        atlas, index = load_atlas(path)
+        atlas = atlas.convert_alpha()
+        self.atlases[path] = (atlas, index)
+        self.sizes[("atlas", path)] = surface_bytes(atlas)
+
+        return {
+            status: [atlas.subsurface(rect) for rect in rects]
+            for status, rects in index.items()
+        }
+
+    def resident_bytes(self):
+        return int(sum(self.sizes.values()))
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "animation_sets": len(self.animation_sets),
+            "atlases": len(self.atlases),
+            "sounds": len(self.sounds),
+            "resident_bytes": self.resident_bytes(),
+        }
+
+    def clear(self):
+        self.atlases.clear()
+        self.animation_sets.clear()
+        self.mask_sets.clear()
+        self.flash_sets.clear()
+        self.frame_tables.clear()
+        self.sounds.clear()
+        self.sizes.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def flash_surface(mask):
+    # white silhouette shown while an entity blinks after being hit
+    surf = mask.to_surface()
+    surf.set_colorkey((0, 0, 0))
+    return surf
+
+
+def surface_bytes(surf):
+    return surf.get_pitch() * surf.get_height()
+
+
+def mask_bytes(mask):
+    width, height = mask.get_size()
+    return (width * height + 7) // 8
+
+
+def sound_bytes_per_second():
+    init = pygame.mixer.get_init()
+    if not init:
+        return 0
+
+    frequency, size, channels = init
+    return frequency * abs(size) // 8 * channels
+
+
+assets = AssetCache()
@@ -0,0 +1,143 @@
+import pygame, json, os
+import numpy as np
+from hashlib import sha1
+from settings import *
+
+
+def pack_atlas(surfaces, width=2048):
+    # simple shelf packing, tallest images first
+    order = sorted(range(len(surfaces)), key=lambda index: -surfaces[index].get_height())
+    width = max([width] + [surf.get_width() for surf in surfaces])
+    rects = [None] * len(surfaces)
+    x = y = shelf_height = 0
+
+    for index in order:
+        w, h = surfaces[index].get_size()
+        if x + w > width:
+            x, y = 0, y + shelf_height
+            shelf_height = 0
+        rects[index] = (x, y, w, h)
+        x += w
+        shelf_height = max(shelf_height, h)
+
+    atlas = pygame.Surface((width, max(y + shelf_height, 1)), pygame.SRCALPHA)
+    for surf, rect in zip(surfaces, rects):
+        atlas.blit(surf, rect[:2])
+
+    return atlas, rects
+
+
+def surface_to_array(surf):
+    # raw RGBA pixels, loading them back is a memory map instead of a PNG decode
+    width, height = surf.get_size()
+    return np.frombuffer(pygame.image.tobytes(surf, "RGBA"), dtype=np.uint8).reshape(
+        height, width, 4
+    )
+
+
+def array_to_surface(pixels):
+    height, width, _ = pixels.shape
+    return pygame.image.frombuffer(np.ascontiguousarray(pixels), (width, height), "RGBA")
+
+
+def frame_files(path):
+    # {status: [frame paths in animation order]} for an animation folder
+    frames = {}
+    for status in sorted(os.listdir(path)):
+        folder = os.path.join(path, status)
+        if os.path.isdir(folder):
+            frames[status] = [
+                os.path.join(folder, file_name)
+                for file_name in sorted(
+                    os.listdir(folder), key=lambda string: int(string.split(".")[0])
+                )
+            ]
+    return frames
+
+
+def files_signature(files):
+    digest = sha1()
+    for path in files:
+        stat = os.stat(path)
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def write_atomic(path, write, mode="w"):
+    # other processes may be reading or rebuilding the same cache file, they
+    # only ever see the old one or the complete new one
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, mode) as file:
+            write(file)
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def atlas_files(path, cache_dir):
+    name = path.strip("/").replace("/", "_")
+    return os.path.join(cache_dir, f"{name}.npy"), os.path.join(cache_dir, f"{name}.json")
+
+
+def build_atlas(path):
+    frames = frame_files(path)
+    files = [file for status in frames.values() for file in status]
+    atlas, rects = pack_atlas([pygame.image.load(file) for file in files])
+
+    index, position = {}, 0
+    for status, status_files in frames.items():
+        index[status] = rects[position : position + len(status_files)]
+        position += len(status_files)
+
+    return atlas, index
+
+
+def save_atlas(path, atlas, index, cache_dir=ATLAS_CACHE):
+    image_path, index_path = atlas_files(path, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    array = surface_to_array(atlas)
+    write_atomic(image_path, lambda file: np.save(file, array), "wb")
+
+    # the index is written last so a half written atlas is never fresh
+    index = {"signature": atlas_signature(path), "frames": index}
+    write_atomic(index_path, lambda file: json.dump(index, file))
+
+
+def atlas_signature(path):
+    return files_signature(
+        [file for status in frame_files(path).values() for file in status]
+    )
+
+
+def load_atlas(path, cache_dir=ATLAS_CACHE):
+    image_path, index_path = atlas_files(path, cache_dir)
+
+    try:
+        with open(index_path) as file:
+            index = json.load(file)
+        if index["signature"] == atlas_signature(path):
+            return array_to_surface(np.load(image_path, mmap_mode="r")), index["frames"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    atlas, index = build_atlas(path)
+    try:
+        save_atlas(path, atlas, index, cache_dir)
+    except OSError:
+        pass
+    return atlas, index
+
+
+if __name__ == "__main__":
+    # python atlas.py: pack every animation folder in settings.PATHS
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+
+    for path in PATHS.values():
+        atlas, index = build_atlas(path)
+        save_atlas(path, atlas, index)
+        frame_count = sum(len(rects) for rects in index.values())
+        print(f"{path}: {frame_count} frames -> {atlas.get_width()}x{atlas.get_height()}")
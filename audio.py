@@ -0,0 +1,95 @@
+import pygame
+from assets import assets
+from settings import *
+
+
+class Voice:
+    __slots__ = ("channel", "name", "priority", "started")
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.name = None
+        self.priority = 0
+        self.started = 0
+
+    def busy(self):
+        return self.name is not None and self.channel.get_busy()
+
+
+class Audio:
+    # music is streamed from disk, effects share one decoded buffer per sound
+    # and play on a fixed set of channels, so a volley costs the same as one shot
+    def __init__(self):
+        self.voices = []
+        self.listener = None
+        self.plays = 0
+        self.stats = {"played": 0, "culled": 0, "limited": 0, "stolen": 0, "dropped": 0}
+
+    def configure(self, channels=AUDIO_CHANNELS):
+        self.voices = []
+        if not pygame.mixer.get_init():
+            return
+
+        pygame.mixer.set_num_channels(channels)
+        self.voices = [Voice(pygame.mixer.Channel(index)) for index in range(channels)]
+
+    def play_music(self, path, volume=1.0, loops=-1):
+        if not pygame.mixer.get_init():
+            return
+
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(loops)
+
+    def stop_music(self):
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop()
+
+    def play(self, name, pos=None):
+        if not self.voices:
+            return
+
+        spec = SOUNDS[name]
+        volume = 1.0
+        if pos is not None and self.listener is not None:
+            distance = pygame.math.Vector2(pos).distance_to(self.listener.rect.center)
+            if distance >= AUDIO_RANGE:
+                self.stats["culled"] += 1
+                return
+            volume = 1 - distance / AUDIO_RANGE
+
+        playing = [voice for voice in self.voices if voice.busy()]
+        if sum(voice.name == name for voice in playing) >= spec["voices"]:
+            self.stats["limited"] += 1
+            return
+
+        voice = self.free_voice(playing, spec["priority"])
+        if voice is None:
+            self.stats["dropped"] += 1
+            return
+
+        self.plays += 1
+        voice.name = name
+        voice.priority = spec["priority"]
+        voice.started = self.plays
+        voice.channel.play(assets.sound(spec["path"], spec["volume"]))
+        voice.channel.set_volume(volume)
+        self.stats["played"] += 1
+
+    def free_voice(self, playing, priority):
+        for voice in self.voices:
+            if not voice.busy():
+                return voice
+
+        # all busy: cut the oldest of the least important sounds below this one
+        lower = [voice for voice in playing if voice.priority < priority]
+        if not lower:
+            return None
+
+        voice = min(lower, key=lambda voice: (voice.priority, voice.started))
+        voice.channel.stop()
+        self.stats["stolen"] += 1
+        return voice
+
+
+audio = Audio()
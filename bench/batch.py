@@ -0,0 +1,191 @@
+# python bench/batch.py --runs 32 --workers 8 --set Coffin.speed=180 --set Cactus.attack_radius=300
+# independent headless matches across a process pool, one JSON line per finished run
+# and a summary per (map, overrides) group at the end
+
+import os, sys, json, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+STATS = ("survived_ticks", "damage_dealt", "damage_taken", "monsters_killed")
+
+
+def init_worker():
+    # every worker keeps its own display and asset cache for all of its runs
+    import pygame
+    from settings import WINDOW_WIDTH, WINDOW_HEIGHT
+
+    pygame.init()
+    pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+
+def warm_caches(jobs):
+    # stale level and atlas caches are rebuilt once here, before any worker
+    # starts, instead of by every worker at the same time
+    import pygame
+    from settings import PATHS
+    from level import load_level
+    from atlas import load_atlas
+
+    init_worker()
+    for level in {job["map"] for job in jobs} - {"synthetic"}:
+        load_level(level)
+    for path in PATHS.values():
+        load_atlas(path)
+    pygame.quit()
+
+
+def load(level, seed, monsters, obstacles):
+    from scenarios import map_level, synthetic_level
+
+    if level == "synthetic":
+        return synthetic_level(monsters, obstacles, seed)
+    return map_level(level)
+
+
+def apply_overrides(game, overrides):
+    # {"Coffin": {"speed": 180}} sets the attribute on every sprite of that class
+    sprites = [game.player] + game.monsters.sprites()
+    for sprite in sprites:
+        for name, value in overrides.get(type(sprite).__name__, {}).items():
+            setattr(sprite, name, value)
+    game.start_health = game.player.health
+
+
+def run_job(job):
+    from main import Game
+    from settings import FIXED_DT
+    from scenarios import ScriptedInput, shuffled_patrol
+
+    start = time.perf_counter()
+    game = Game(
+        headless=True,
+        level=load(job["map"], job["seed"], job["monsters"], job["obstacles"]),
+    )
+    game.input_source = ScriptedInput(game, shuffled_patrol(job["seed"]))
+    apply_overrides(game, job["overrides"])
+
+    for _ in range(job["max_ticks"]):
+        game.update(FIXED_DT)
+        if game.death_tick is not None:
+            break
+
+    return dict(job, **game.stats(), seconds=time.perf_counter() - start)
+
+
+def parse_overrides(assignments):
+    # ["Coffin.speed=180"] -> {"Coffin": {"speed": 180}}
+    overrides = {}
+    for assignment in assignments:
+        target, _, value = assignment.partition("=")
+        cls, _, attribute = target.partition(".")
+        try:
+            value = json.loads(value)
+        except ValueError:
+            pass
+        overrides.setdefault(cls, {})[attribute] = value
+    return overrides
+
+
+def make_jobs(args):
+    if args.jobs:
+        with open(args.jobs) as file:
+            specs = json.load(file)
+    else:
+        overrides = parse_overrides(args.set)
+        specs = [
+            {"map": level, "seed": args.seed + index, "overrides": overrides}
+            for level in args.map or ["data/map.tmx"]
+            for index in range(args.runs)
+        ]
+
+    defaults = {
+        "map": "data/map.tmx",
+        "seed": args.seed,
+        "max_ticks": args.ticks,
+        "monsters": args.monsters,
+        "obstacles": args.obstacles,
+        "overrides": {},
+    }
+    return [dict(defaults, **spec) for spec in specs]
+
+
+def summarize(results):
+    groups = {}
+    for result in results:
+        key = (result["map"], json.dumps(result["overrides"], sort_keys=True))
+        groups.setdefault(key, []).append(result)
+
+    summary = []
+    for (level, overrides), runs in groups.items():
+        row = {"map": level, "overrides": json.loads(overrides), "runs": len(runs)}
+        for stat in STATS:
+            values = [run[stat] for run in runs]
+            row[stat] = {
+                "mean": sum(values) / len(values),
+                "min": min(values),
+                "max": max(values),
+            }
+        row["deaths"] = sum(run["player_dead"] for run in runs)
+        summary.append(row)
+    return summary
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Parallel headless Western shooter matches")
+    parser.add_argument("--runs", type=int, default=8, help="runs per map, seeds counting up from --seed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--ticks", type=int, default=3600, help="upper bound, a run ends when the player dies")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--map", action="append", help=".tmx path or 'synthetic', repeatable")
+    parser.add_argument("--monsters", type=int, default=200, help="for synthetic maps")
+    parser.add_argument("--obstacles", type=int, default=500, help="for synthetic maps")
+    parser.add_argument("--set", action="append", default=[], metavar="CLASS.ATTR=VALUE")
+    parser.add_argument("--jobs", metavar="FILE", help="JSON list of run specs instead of --map/--set/--runs")
+    parser.add_argument("--output", help="also append every run to this JSON lines file")
+    args = parser.parse_args()
+
+    jobs = make_jobs(args)
+    warm_caches(jobs)
+    results = []
+    output = open(args.output, "a") if args.output else None
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker) as pool:
+        futures = [pool.submit(run_job, job) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            line = json.dumps(result)
+            print(line, flush=True)
+            if output:
+                output.write(line + "\n")
+                output.flush()
+
+    if output:
+        output.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        json.dumps(
+            {
+                "summary": summarize(results),
+                "workers": args.workers,
+                "seconds": elapsed,
+                "runs_per_second": len(results) / elapsed,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
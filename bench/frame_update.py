@@ -0,0 +1,117 @@
+import os, sys, time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+from settings import *
+from game_clock import game_clock
+
+MONSTERS = 200
+FRAMES = 300
+# every tenth monster was just hit and blinks
+BLINKING = 10
+
+
+def blinking(monster):
+    return not monster.is_vulnerable and monster.wave_value()
+
+
+def legacy_swap(monster):
+    # what every monster paid per frame before masks and flashes were
+    # precomputed: a mask always, the flash only while blinking
+    monster.image = monster.animations[monster.status][int(monster.frame_index)]
+    monster.mask = pygame.mask.from_surface(monster.image)
+    if blinking(monster):
+        white_surf = pygame.mask.from_surface(monster.image).to_surface()
+        white_surf.set_colorkey((0, 0, 0))
+        monster.image = white_surf
+
+
+def cached_swap(monster):
+    monster.set_frame(monster.animation(), int(monster.frame_index))
+    if blinking(monster):
+        monster.image = monster.flash
+
+
+def spawn(count):
+    from player import Player
+    from monster import Coffin, Cactus
+    from spatial import ObstacleGroup
+
+    all_sprites = pygame.sprite.Group()
+    obstacles = ObstacleGroup()
+
+    player = Player(
+        game=None,
+        pos=(0, 0),
+        groups=all_sprites,
+        path=PATHS["player"],
+        collision_sprites=obstacles,
+        create_bullet=lambda pos, direction: None,
+    )
+
+    monsters = []
+    for index in range(count):
+        pos = (index % 20 * 100, index // 20 * 100)
+        if index % 2:
+            monsters.append(
+                Coffin(pos, all_sprites, PATHS["coffin"], obstacles, player)
+            )
+        else:
+            monsters.append(
+                Cactus(pos, all_sprites, PATHS["cactus"], obstacles, player, lambda pos, direction: None)
+            )
+    return monsters
+
+
+def hit(monsters):
+    for monster in monsters[::BLINKING]:
+        monster.is_vulnerable = False
+        monster.hit_time = game_clock.get_ticks()
+
+
+def measure(swap, monsters, frames):
+    start = time.perf_counter()
+    for frame in range(frames):
+        for monster in monsters:
+            monster.frame_index = frame % len(monster.animations[monster.status])
+            swap(monster)
+    return (time.perf_counter() - start) / frames
+
+
+def measure_update(monsters, frames):
+    # the whole monster update with precomputed frames, to put the swap in
+    # proportion
+    start = time.perf_counter()
+    for _ in range(frames):
+        game_clock.advance(FIXED_DT)
+        for monster in monsters:
+            monster.update(FIXED_DT)
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+    monsters = spawn(MONSTERS)
+    hit(monsters)
+    before = measure(legacy_swap, monsters, FRAMES)
+    after = measure(cached_swap, monsters, FRAMES)
+    update = measure_update(monsters, FRAMES)
+
+    print(f"{MONSTERS} monsters, {FRAMES} frames, {len(monsters[::BLINKING])} blinking")
+    print(f"frame swap before: {before * 1000:.3f} ms/frame")
+    print(f"frame swap after:  {after * 1000:.3f} ms/frame")
+    print(f"speedup: {before / after:.1f}x")
+    print(f"whole update now: {update * 1000:.3f} ms/frame")
+    print(f"whole update before, estimated: {(update + before - after) * 1000:.3f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# python bench/run.py --scenario synthetic --monsters 500 --bullets 1000 --output after.json
+# scripted headless runs with per-phase frame time percentiles, compare the JSON between commits
+
+import os, sys, gc, json, random, subprocess, time, tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+from settings import *
+from main import Game
+from game_clock import game_clock
+from scenarios import ScriptedInput, map_level, synthetic_level, top_up_bullets
+
+PHASES = ("update", "collision", "draw", "flip")
+
+
+def percentiles(samples):
+    if not samples:
+        return {}
+
+    ordered = sorted(samples)
+
+    def at(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {
+        "p50": at(0.50),
+        "p95": at(0.95),
+        "p99": at(0.99),
+        "mean": sum(ordered) / len(ordered),
+        "max": ordered[-1],
+    }
+
+
+def commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scenario, ticks, monsters, bullets, obstacles, seed, draw, allocations=False):
+    random.seed(seed)
+    rng = random.Random(seed)
+
+    pygame.init()
+    pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    if scenario == "map":
+        level = map_level()
+    else:
+        level = synthetic_level(monsters, obstacles, seed)
+
+    game = Game(headless=True, level=level)
+    game.input_source = ScriptedInput(game)
+    if draw and BAKE_STATIC_LAYER:
+        game.all_sprites.bake(game.obstacles.sprites())
+
+    timings = {phase: [] for phase in PHASES}
+    frame_times = []
+    draw_calls = []
+    allocated = []
+    retained = []
+    collections = sum(stat["collections"] for stat in gc.get_stats())
+    # tracing every allocation slows the whole run down, so it is opt in and
+    # its timings are not comparable with untraced ones
+    if allocations:
+        tracemalloc.start()
+
+    for _ in range(ticks):
+        top_up_bullets(game, bullets, rng)
+        blocks = sys.getallocatedblocks()
+        if allocations:
+            tracemalloc.reset_peak()
+            traced, _ = tracemalloc.get_traced_memory()
+
+        start = time.perf_counter()
+        game_clock.advance(FIXED_DT)
+        game.update_sprites(FIXED_DT)
+        updated = time.perf_counter()
+        game.bullet_collision()
+        collided = time.perf_counter()
+        if draw:
+            dirty = game.draw_groups()
+        drawn = time.perf_counter()
+        if draw:
+            if dirty is None:
+                pygame.display.update()
+            else:
+                pygame.display.update(dirty)
+        flipped = time.perf_counter()
+        game.ticks += 1
+
+        timings["update"].append((updated - start) * 1000)
+        timings["collision"].append((collided - updated) * 1000)
+        timings["draw"].append((drawn - collided) * 1000)
+        timings["flip"].append((flipped - drawn) * 1000)
+        frame_times.append((flipped - start) * 1000)
+        if draw:
+            draw_calls.append(game.all_sprites.draw_calls)
+        if allocations:
+            allocated.append((tracemalloc.get_traced_memory()[1] - traced) / 1024)
+        retained.append(sys.getallocatedblocks() - blocks)
+
+    if allocations:
+        tracemalloc.stop()
+
+    return {
+        "scenario": scenario,
+        "commit": commit(),
+        "params": {
+            "ticks": ticks,
+            "monsters": len(game.monsters) if scenario == "map" else monsters,
+            "bullets": bullets,
+            "obstacles": len(game.obstacles),
+            "seed": seed,
+            "draw": draw,
+            "allocations": allocations,
+        },
+        "phases_ms": {phase: percentiles(samples) for phase, samples in timings.items()},
+        "frame_ms": percentiles(frame_times),
+        # blits per drawn frame, empty without drawing
+        "draw_calls": percentiles(draw_calls),
+        # most memory each tick held on top of what it started with, only
+        # with --allocations
+        "allocated_kib": percentiles(allocated),
+        # blocks still allocated after each tick minus the ones before it,
+        # negative when a tick frees more than it keeps
+        "retained_blocks": percentiles(retained),
+        "gc_collections": sum(stat["collections"] for stat in gc.get_stats()) - collections,
+        "monsters_left": len(game.monsters),
+        "ai_scheduler": game.scheduler.stats(),
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scripted Western shooter benchmarks")
+    parser.add_argument("--scenario", choices=("map", "synthetic"), default="map")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--monsters", type=int, default=200)
+    parser.add_argument("--bullets", type=int, default=0)
+    parser.add_argument("--obstacles", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-draw", dest="draw", action="store_false")
+    parser.add_argument(
+        "--allocations", action="store_true", help="trace memory allocated per tick, slows the run"
+    )
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = run(
+        args.scenario,
+        args.ticks,
+        args.monsters,
+        args.bullets,
+        args.obstacles,
+        args.seed,
+        args.draw,
+        args.allocations,
+    )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
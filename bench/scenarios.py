@@ -0,0 +1,76 @@
+import pygame, random
+from math import sqrt
+from settings import *
+from level import Level, load_level
+from replay import held
+
+# (keys held, ticks) repeated for the whole run
+PATROL = [
+    ((pygame.K_RIGHT,), 90),
+    ((pygame.K_SPACE,), 20),
+    ((pygame.K_DOWN,), 90),
+    ((pygame.K_SPACE,), 20),
+    ((pygame.K_LEFT,), 90),
+    ((), 30),
+    ((pygame.K_UP,), 90),
+    ((pygame.K_SPACE,), 20),
+]
+
+def shuffled_patrol(seed, steps=PATROL):
+    # same moves in a seeded order with jittered lengths, for batches of runs
+    rng = random.Random(seed)
+    steps = [(keys, max(1, int(ticks * rng.uniform(0.5, 1.5)))) for keys, ticks in steps]
+    rng.shuffle(steps)
+    return steps
+
+
+class ScriptedInput:
+    def __init__(self, game, steps=PATROL):
+        self.game = game
+        self.timeline = []
+        for keys, ticks in steps:
+            self.timeline.extend([held(keys)] * ticks)
+
+    def __call__(self):
+        return self.timeline[self.game.ticks % len(self.timeline)]
+
+
+def map_level(path="data/map.tmx"):
+    return load_level(path)
+
+
+def synthetic_level(monsters, obstacles, seed=0):
+    rng = random.Random(seed)
+
+    # leave room for everything to spawn without piling up
+    side = max(60, int(sqrt((monsters + obstacles) * 4)) + 1)
+    center = (side // 2 * TILE_SIZE, side // 2 * TILE_SIZE)
+
+    surf = pygame.Surface((TILE_SIZE, TILE_SIZE)).convert()
+    surf.fill((120, 80, 40))
+
+    free = [
+        (x, y)
+        for x in range(side)
+        for y in range(side)
+        if abs(x - side // 2) > 2 or abs(y - side // 2) > 2
+    ]
+    rng.shuffle(free)
+
+    fences = [((x * TILE_SIZE, y * TILE_SIZE), surf) for x, y in free[:obstacles]]
+
+    entities = [("Player", center)]
+    for index, (x, y) in enumerate(free[obstacles : obstacles + monsters]):
+        name = "Coffin" if index % 2 else "Cactus"
+        entities.append((name, (x * TILE_SIZE + TILE_SIZE / 2, y * TILE_SIZE + TILE_SIZE / 2)))
+
+    return Level((side * TILE_SIZE, side * TILE_SIZE), TILE_SIZE, fences, [], entities)
+
+
+def top_up_bullets(game, count, rng):
+    # keeps count bullets alive around the player
+    while len(game.bullets) < count:
+        x = game.player.rect.centerx + rng.uniform(-WINDOW_WIDTH, WINDOW_WIDTH)
+        y = game.player.rect.centery + rng.uniform(-WINDOW_HEIGHT, WINDOW_HEIGHT)
+        direction = pygame.math.Vector2(1, 0).rotate(rng.uniform(0, 360))
+        game.create_bullet((x, y), direction)
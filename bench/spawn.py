@@ -0,0 +1,99 @@
+# python bench/spawn.py: resident bytes per spawned monster and per bullet, with
+# the slotted, store backed classes and with dict backed copies of them
+
+import os, sys, time, tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+from settings import *
+from store import StoreField, StorePosition
+
+COUNT = 2000
+POINTER_BYTES = 8
+
+
+def dict_backed(cls):
+    # cls with every slot and store field hidden behind a plain class
+    # attribute, so instances keep their state in __dict__ as they did before
+    names = set()
+    for base in cls.__mro__:
+        names.update(vars(base).get("__slots__", ()))
+        names.update(
+            name
+            for name, value in vars(base).items()
+            if isinstance(value, (StoreField, StorePosition))
+        )
+    legacy = type(f"DictBacked{cls.__name__}", (cls,), dict.fromkeys(names))
+    # the inherited slots are still allocated, empty, with every instance
+    slot_bytes = POINTER_BYTES * sum(len(vars(base).get("__slots__", ())) for base in cls.__mro__)
+    return legacy, slot_bytes
+
+
+def measure(spawn, count):
+    # warm up once so shared assets and caches are not counted
+    keep = [spawn(0)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    keep += [spawn(index) for index in range(1, count + 1)]
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count, elapsed / count * 1e6
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+    from player import Player
+    from monster import Coffin
+    from spatial import ObstacleGroup
+    from sprite import Bullet, BulletPool
+
+    obstacles = ObstacleGroup()
+    player = Player(
+        game=None,
+        pos=(0, 0),
+        groups=[],
+        path=PATHS["player"],
+        collision_sprites=obstacles,
+        create_bullet=lambda pos, direction: None,
+    )
+
+    DictCoffin, coffin_slots = dict_backed(Coffin)
+    DictBullet, bullet_slots = dict_backed(Bullet)
+    surf = pygame.image.load("graphics/other/particle.png").convert_alpha()
+
+    # Monster.__init__ still takes a store slot for the dict backed coffin, so
+    # its figure is a little above what the old class really cost
+    def spawn_monster(cls):
+        monsters = pygame.sprite.Group()
+        return lambda index: cls((index * 10, 0), monsters, PATHS["coffin"], obstacles, player)
+
+    def spawn_bullet(cls):
+        # a fresh pool per run so nothing is reused from the one before
+        pool = BulletPool(surf, [pygame.sprite.Group()])
+        return lambda index: cls((index, 0), pygame.math.Vector2(1, 0), surf, pool.groups, pool=pool)
+
+    rows = [
+        ("monster", "before", coffin_slots, measure(spawn_monster(DictCoffin), COUNT)),
+        ("monster", "after", 0, measure(spawn_monster(Coffin), COUNT)),
+        ("bullet", "before", bullet_slots, measure(spawn_bullet(DictBullet), COUNT)),
+        ("bullet", "after", 0, measure(spawn_bullet(Bullet), COUNT)),
+    ]
+    for kind, label, slot_bytes, (size, us) in rows:
+        print(f"{kind} {label}: {size - slot_bytes:.0f} bytes, {us:.1f} us to spawn")
+    print("bullet hot fields are not in a store on purpose, bullets are pooled and")
+    print("only lose their __dict__ entries to __slots__")
+
+
+if __name__ == "__main__":
+    main()
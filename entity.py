@@ -1,19 +1,30 @@
 import pygame
 from pygame.math import Vector2 as vector
-from os import walk
 from math import sin
+from assets import assets
+from game_clock import game_clock
+from animation import Facing, Action
 
 
 class Entity(pygame.sprite.Sprite):
+    __slots__ = (
+        "frame_index", "facing", "action", "VULNERABILITY_TIME", "image", "rect",
+        "state_machine", "previous_state", "pos", "direction", "speed",
+        "hitbox", "collision_sprites", "old_hitbox", "health", "is_vulnerable",
+        "hit_time", "animations", "masks",
+        "flashes", "frame_table", "mask", "flash",
+    )
+
     def __init__(self, pos, groups, path, collision_sprites):
         super().__init__(groups)
 
         self.import_assets(path)
         self.frame_index = 0
-        self.status = "down_idle"
+        self.facing = Facing.DOWN
+        self.action = Action.IDLE
         self.VULNERABILITY_TIME = 400
 
-        self.image = self.animations[self.status][self.frame_index]
+        self.set_frame(self.animation(), int(self.frame_index))
         self.rect = self.image.get_rect(center=pos)
 
         self.state_machine = None
@@ -27,32 +38,22 @@ class Entity(pygame.sprite.Sprite):
         # collisions
         self.hitbox = self.rect.inflate(-self.rect.width * 0.5, -self.rect.height / 2)
         self.collision_sprites = collision_sprites
-        self.mask = pygame.mask.from_surface(self.image)
 
         # health
         self.health = 3
         self.is_vulnerable = True
         self.hit_time = None
 
-        # sound
-        self.hit_sound = pygame.mixer.Sound("sound/hit.mp3")
-        self.hit_sound.set_volume(0.1)
-        self.shoot_sound = pygame.mixer.Sound("sound/bullet.wav")
-        self.shoot_sound.set_volume(0.1)
-
     def blink(self):
         if not self.is_vulnerable:
             if self.wave_value():
-                mask = pygame.mask.from_surface(self.image)
-                white_surf = mask.to_surface()
-                white_surf.set_colorkey((0, 0, 0))
-                self.image = white_surf
+                self.image = self.flash
 
                 if not self.state_machine.state == "damaged":
                     self.state_machine.take_damage()
 
     def wave_value(self):
-        return sin(pygame.time.get_ticks()) >= 0
+        return sin(game_clock.get_ticks()) >= 0
 
     def check_death(self):
         if self.health <= 0:
@@ -65,31 +66,38 @@ class Entity(pygame.sprite.Sprite):
 
     def vulnerability_timer(self):
         if not self.is_vulnerable:
-            current_time = pygame.time.get_ticks()
+            current_time = game_clock.get_ticks()
             if current_time - self.hit_time > self.VULNERABILITY_TIME:
                 self.is_vulnerable = True
 
     def import_assets(self, path):
-        self.animations = {}
-
-        for index, folder in enumerate(walk(path)):
-            if index == 0:
-                for name in folder[1]:
-                    self.animations[name] = []
-            else:
-                for file_name in sorted(
-                    folder[2], key=lambda string: int(string.split(".")[0])
-                ):
-                    path = folder[0].replace("\\", "/") + "/" + file_name
-                    surf = pygame.image.load(path).convert_alpha()
-                    key = folder[0].split("\\")[1]
-                    self.animations[key].append(surf)
+        # animations and masks are shared by every entity loaded from the same path
+        self.animations = assets.animations(path)
+        self.masks = assets.masks(path)
+        self.flashes = assets.flashes(path)
+        self.frame_table = assets.frame_table(path)
+
+    @property
+    def status(self):
+        # folder name of the current animation, kept for logs and tools
+        return self.animation().name
+
+    def animation(self):
+        return self.frame_table[self.facing][self.action]
+
+    def set_frame(self, animation, index):
+        self.image = animation.frames[index]
+        self.mask = animation.masks[index]
+        self.flash = animation.flashes[index]
 
     def move(self, dt):
         # Normalize direction vector if its magnitude is not zero
         if self.direction.magnitude() != 0:
             self.direction = self.direction.normalize()
 
+        # obstacles are looked up around the swept hitbox of this move
+        self.old_hitbox = self.hitbox.copy()
+
         # Calculate horizontal movement
         horizontal_movement = self.direction.x * self.speed * dt
         self.pos.x += horizontal_movement
@@ -105,7 +113,8 @@ class Entity(pygame.sprite.Sprite):
         self.collision("vertical")
 
     def collision(self, direction):
-        for sprite in self.collision_sprites.sprites():
+        area = self.hitbox.union(self.old_hitbox)
+        for sprite in self.collision_sprites.nearby(area):
             if sprite.hitbox.colliderect(self.hitbox):
                 if direction == "horizontal":
                     if self.direction.x > 0:  # moving right
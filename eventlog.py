@@ -0,0 +1,80 @@
+import threading
+from collections import deque, namedtuple
+from queue import SimpleQueue
+
+DEBUG, INFO, WARNING = 10, 20, 30
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING"}
+
+Event = namedtuple("Event", "tick level entity source target")
+
+
+class EventLog:
+    def __init__(self, capacity=4096):
+        # callers check enabled before building anything, so a disabled log is free
+        self.enabled = False
+        self.level = INFO
+        self.events = deque(maxlen=capacity)
+        self.tick = 0
+
+        self.queue = None
+        self.writer = None
+
+    def configure(self, enabled=True, level=INFO, path=None, batch_size=256):
+        self.close()
+        self.enabled = enabled
+        self.level = level
+        if path:
+            self.queue = SimpleQueue()
+            self.writer = threading.Thread(
+                target=self.write, args=(path, batch_size), daemon=True
+            )
+            self.writer.start()
+
+    def transition(self, entity, source, target):
+        level = DEBUG if source == target else INFO
+        if level < self.level:
+            return
+
+        event = Event(self.tick, level, entity, source, target)
+        self.events.append(event)
+        if self.queue is not None:
+            self.queue.put(event)
+
+    def write(self, path, batch_size):
+        # runs on the writer thread, the game loop only pushes to the queue
+        with open(path, "a") as file:
+            batch = []
+            while True:
+                event = self.queue.get()
+                if event is not None:
+                    batch.append(
+                        f"{event.tick}\t{LEVEL_NAMES[event.level]}\t{event.entity}\t{event.source}\t{event.target}\n"
+                    )
+                if event is None or len(batch) >= batch_size or self.queue.empty():
+                    file.writelines(batch)
+                    file.flush()
+                    batch = []
+                if event is None:
+                    return
+
+    def close(self):
+        if self.writer is not None:
+            self.queue.put(None)
+            self.writer.join()
+        self.queue = None
+        self.writer = None
+
+    def query(self, entity=None, source=None, target=None, since=None, until=None, level=None):
+        return [
+            event
+            for event in self.events
+            if (entity is None or event.entity == entity)
+            and (source is None or event.source == source)
+            and (target is None or event.target == target)
+            and (since is None or event.tick >= since)
+            and (until is None or event.tick <= until)
+            and (level is None or event.level >= level)
+        ]
+
+
+event_log = EventLog()
@@ -0,0 +1,120 @@
+import numpy as np
+import pygame
+from collections import deque
+from math import ceil, sqrt
+from pygame.math import Vector2 as vector
+from settings import *
+
+# neighbour offsets a monster can step to, diagonals only when both sides are open
+STEPS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, -1), (-1, 1), (1, 1)]
+STEP_DIRECTIONS = [vector(x, y) / sqrt(x * x + y * y) for x, y in STEPS]
+# room past the radius for paths that swing out around an obstacle
+DETOUR_TILES = 4
+
+
+class FlowField:
+    # one breadth first search from the player's tile gives every monster
+    # around it a step direction around the obstacles, looked up per tile
+    def __init__(self, area, obstacles, agent_size=(0, 0), tile_size=TILE_SIZE, radius=None):
+        self.tile_size = tile_size
+        self.columns = area.width // tile_size
+        self.rows = area.height // tile_size
+
+        # a tile is blocked when an agent hitbox around its middle would touch
+        # an obstacle, so paths keep big monsters clear of walls and corners
+        self.blocked = np.zeros((self.rows, self.columns), dtype=bool)
+        core = pygame.Rect(0, 0, tile_size // 2, tile_size // 2)
+        for obstacle in obstacles:
+            hitbox = obstacle.hitbox.inflate(agent_size)
+            left, top = hitbox.left // tile_size, hitbox.top // tile_size
+            right = (hitbox.right - 1) // tile_size
+            bottom = (hitbox.bottom - 1) // tile_size
+            for row in range(max(top, 0), min(bottom, self.rows - 1) + 1):
+                for column in range(max(left, 0), min(right, self.columns - 1) + 1):
+                    core.center = (column * tile_size + tile_size // 2, row * tile_size + tile_size // 2)
+                    if hitbox.colliderect(core):
+                        self.blocked[row, column] = True
+
+        self.open_cells = (~self.blocked).tolist()
+
+        # only tiles this far from the goal are searched, monsters further out
+        # do not chase, so the cost does not grow with the map
+        self.reach = None if radius is None else ceil(radius / tile_size) + DETOUR_TILES
+        self.bounds = pygame.Rect(0, 0, self.columns, self.rows)
+
+        self.goal = None
+        self.window = pygame.Rect(0, 0, 0, 0)
+        self.distance = np.full((0, 0), -1, dtype=np.int32)
+        self.steering = []
+        self.searches = 0
+
+    def cell(self, pos):
+        column = int(pos[0]) // self.tile_size
+        row = int(pos[1]) // self.tile_size
+        if 0 <= column < self.columns and 0 <= row < self.rows:
+            return row * self.columns + column
+        return None
+
+    def follow(self, pos):
+        goal = self.cell(pos)
+        if goal is not None and goal != self.goal:
+            self.goal = goal
+            self.search(goal)
+
+    def search(self, goal):
+        row, column = divmod(goal, self.columns)
+        if self.reach is None:
+            window = self.bounds.copy()
+        else:
+            size = 2 * self.reach + 1
+            window = pygame.Rect(column - self.reach, row - self.reach, size, size).clip(self.bounds)
+        left, top, width, height = window
+
+        open_cells = [
+            is_open for line in self.open_cells[top : top + height] for is_open in line[left : left + width]
+        ]
+        start = (row - top) * width + column - left
+        distance = [-1] * (width * height)
+        distance[start] = 0
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            step = distance[cell] + 1
+            y, x = divmod(cell, width)
+            for neighbour, inside in (
+                (cell - 1, x > 0),
+                (cell + 1, x < width - 1),
+                (cell - width, y > 0),
+                (cell + width, y < height - 1),
+            ):
+                if inside and open_cells[neighbour] and distance[neighbour] < 0:
+                    distance[neighbour] = step
+                    queue.append(neighbour)
+
+        self.window = window
+        self.distance = np.array(distance, dtype=np.int32).reshape(height, width)
+        self.steering = self.descend(self.distance)
+        self.searches += 1
+
+    def descend(self, distance):
+        # every reached tile points at its closest neighbour to the goal
+        rows, columns = distance.shape
+        unreachable = np.iinfo(np.int32).max
+        padded = np.pad(np.where(distance < 0, unreachable, distance), 1, constant_values=unreachable)
+        shifted = [padded[1 + y : 1 + y + rows, 1 + x : 1 + x + columns] for x, y in STEPS]
+        for index, (x, y) in enumerate(STEPS[4:], 4):
+            cut = (shifted[STEPS.index((x, 0))] == unreachable) | (shifted[STEPS.index((0, y))] == unreachable)
+            shifted[index] = np.where(cut, unreachable, shifted[index])
+
+        best = np.argmin(np.stack(shifted), axis=0)
+        # next to the goal or cut off from it, monsters steer straight instead
+        best[(distance <= 1)] = -1
+        return [STEP_DIRECTIONS[step] if step >= 0 else None for step in best.ravel().tolist()]
+
+    def direction(self, pos):
+        # outside the searched window monsters steer straight
+        column = int(pos[0]) // self.tile_size - self.window.left
+        row = int(pos[1]) // self.tile_size - self.window.top
+        if 0 <= column < self.window.width and 0 <= row < self.window.height:
+            return self.steering[row * self.window.width + column]
+        return None
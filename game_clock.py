@@ -0,0 +1,17 @@
+class GameClock:
+    # simulation time in milliseconds, advanced by the game loop instead of
+    # read from the wall clock so headless runs behave like real-time ones
+    def __init__(self):
+        self.time = 0
+
+    def advance(self, dt):
+        self.time += dt * 1000
+
+    def get_ticks(self):
+        return int(self.time)
+
+    def reset(self):
+        self.time = 0
+
+
+game_clock = GameClock()
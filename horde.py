@@ -0,0 +1,74 @@
+import numpy as np
+from game_clock import game_clock
+from monster import monster_store
+from animation import FACINGS
+
+LEFT, RIGHT, UP, DOWN = FACINGS
+
+
+class Horde:
+    # batched version of Monster.get_player_distance_direction, face_player and
+    # the walk_to_player decision, computed for every monster in one pass
+    def __init__(self, monsters, player):
+        self.monsters = monsters
+        self.player = player
+        self.members = []
+        self.stamp = None
+
+    def rebuild(self, members):
+        self.members = members
+        self.slots = np.array([monster.slot for monster in members], dtype=np.intp)
+        self.notice_radius = np.array([monster.notice_radius for monster in members], dtype=float)
+        self.walk_radius = np.array([monster.walk_radius for monster in members], dtype=float)
+        self.attack_radius = np.array([monster.attack_radius for monster in members], dtype=float)
+
+    def refresh(self):
+        # the first monster to ask in a tick triggers the pass for everyone
+        if self.stamp != game_clock.time:
+            self.stamp = game_clock.time
+            self.update()
+
+    def update(self):
+        members = self.monsters.sprites()
+        if members != self.members:
+            self.rebuild(members)
+        if not members:
+            return
+
+        # rect centers are the rounded store positions, read them as columns
+        xs = np.rint(monster_store.view("x")[self.slots])
+        ys = np.rint(monster_store.view("y")[self.slots])
+        player_center = self.player.rect.center
+        dx = player_center[0] - xs
+        dy = player_center[1] - ys
+
+        distance = np.hypot(dx, dy)
+        moving = distance != 0
+        safe_distance = np.where(moving, distance, 1)
+        ux = np.where(moving, dx / safe_distance, 0)
+        uy = np.where(moving, dy / safe_distance, 0)
+
+        # same rules as Monster.face_player, -1 keeps the current facing
+        horizontal = (uy > -0.5) & (uy < 0.5)
+        facing = np.full(len(members), -1)
+        facing[horizontal & (ux < 0)] = LEFT
+        facing[horizontal & (ux > 0)] = RIGHT
+        facing[~horizontal & (uy < 0)] = UP
+        facing[~horizontal & (uy > 0)] = DOWN
+        facing[distance >= self.notice_radius] = -1
+
+        chase = (self.attack_radius < distance) & (distance < self.walk_radius)
+
+        for monster, dist, x, y, face, chasing in zip(
+            members,
+            distance.tolist(),
+            ux.tolist(),
+            uy.tolist(),
+            facing.tolist(),
+            chase.tolist(),
+        ):
+            monster.ai_valid = True
+            monster.player_distance = dist
+            monster.player_direction.update(x, y)
+            monster.ai_facing = FACINGS[face] if face >= 0 else None
+            monster.ai_chase = chasing
@@ -0,0 +1,89 @@
+import pygame
+from collections import OrderedDict
+from settings import *
+
+
+class TextCache:
+    # fonts are loaded once per size, rendered strings are kept until the
+    # least recently used ones have to make room
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size):
+        if size not in self.fonts:
+            self.fonts[size] = pygame.font.Font(None, size)
+        return self.fonts[size]
+
+    def render(self, text, size, colour):
+        key = (text, size, colour)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font(size).render(text, True, colour)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.fonts.clear()
+        self.surfaces.clear()
+
+
+text_cache = TextCache()
+
+
+class HUD:
+    def __init__(self, game, size=HUD_FONT_SIZE):
+        self.game = game
+        self.size = size
+        self.values = None
+        self.panel = None
+        self.width = 0
+        self.rect = pygame.Rect(0, 0, 0, 0)
+
+    def read(self):
+        return (
+            int(max(self.game.player.health, 0)),
+            len(self.game.monsters),
+            round(self.game.clock.get_fps()),
+        )
+
+    def build(self, values):
+        health, monsters, fps = values
+        lines = [
+            text_cache.render(f"Health {health}", self.size, (255, 255, 255)),
+            text_cache.render(f"Monsters {monsters}", self.size, (255, 255, 255)),
+            text_cache.render(f"FPS {fps}", self.size, (255, 255, 255)),
+        ]
+
+        # opaque and never narrower than before, so drawing it again always
+        # covers the last one and never changes a pixel it does not own
+        self.width = max(self.width, max(line.get_width() for line in lines) + 16)
+        height = sum(line.get_height() for line in lines) + 12
+        panel = pygame.Surface((self.width, height)).convert()
+        panel.fill((30, 20, 15))
+        y = 6
+        for line in lines:
+            panel.blit(line, (8, y))
+            y += line.get_height()
+        return panel
+
+    def draw(self, surface):
+        # returns the screen rect it covered
+        values = self.read()
+        if values != self.values:
+            self.values = values
+            self.panel = self.build(values)
+
+        self.rect = self.panel.get_rect(topright=(surface.get_width() - 8, 8))
+        surface.blit(self.panel, self.rect)
+        return self.rect
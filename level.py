@@ -0,0 +1,198 @@
+import pygame, json, os, sys, time
+import numpy as np
+from xml.etree import ElementTree
+from settings import *
+from atlas import pack_atlas, files_signature, surface_to_array, array_to_surface, write_atomic
+
+BUNDLE_VERSION = 1
+
+
+class Level:
+    def __init__(self, size, tile_size, fences, objects, entities):
+        self.rect = pygame.Rect((0, 0), size)
+        self.tile_size = tile_size
+
+        # lists of (pos, surf) and (name, pos)
+        self.fences = fences
+        self.objects = objects
+        self.entities = entities
+
+        self.source = None
+        self.load_time = 0
+
+
+def load_level(tmx_path, cache_dir=LEVEL_CACHE):
+    start = time.perf_counter()
+    bundle_dir = bundle_path(tmx_path, cache_dir)
+
+    if bundle_is_fresh(tmx_path, bundle_dir):
+        level = load_bundle(bundle_dir)
+        level.source = "bundle"
+    else:
+        level = read_tmx(tmx_path)
+        try:
+            compile_level(tmx_path, bundle_dir, level)
+        except OSError:
+            pass
+        level.source = "tmx"
+
+    level.load_time = time.perf_counter() - start
+    return level
+
+
+def read_tmx(tmx_path):
+    from pytmx.util_pygame import load_pygame
+
+    tmx_map = load_pygame(tmx_path)
+    fences = [
+        ((x * tmx_map.tilewidth, y * tmx_map.tileheight), surf)
+        for x, y, surf in tmx_map.get_layer_by_name("Fence").tiles()
+    ]
+    objects = [((obj.x, obj.y), obj.image) for obj in tmx_map.get_layer_by_name("Objects")]
+    entities = [(obj.name, (obj.x, obj.y)) for obj in tmx_map.get_layer_by_name("Entities")]
+
+    size = (tmx_map.width * tmx_map.tilewidth, tmx_map.height * tmx_map.tileheight)
+    return Level(size, tmx_map.tilewidth, fences, objects, entities)
+
+
+def bundle_path(tmx_path, cache_dir):
+    name = os.path.splitext(os.path.basename(tmx_path))[0]
+    return os.path.join(cache_dir, name)
+
+
+def source_files(tmx_path):
+    # the map, every tileset it references and every image those tilesets use
+    files = [tmx_path]
+    folder = os.path.dirname(tmx_path)
+
+    for tileset in ElementTree.parse(tmx_path).getroot().iter("tileset"):
+        if "source" in tileset.attrib:
+            tsx_path = os.path.normpath(os.path.join(folder, tileset.attrib["source"]))
+            files.append(tsx_path)
+            tsx_folder = os.path.dirname(tsx_path)
+            for image in ElementTree.parse(tsx_path).getroot().iter("image"):
+                files.append(os.path.normpath(os.path.join(tsx_folder, image.attrib["source"])))
+
+        for image in tileset.iter("image"):
+            files.append(os.path.normpath(os.path.join(folder, image.attrib["source"])))
+
+    return files
+
+
+def source_signature(tmx_path):
+    return f"{BUNDLE_VERSION}:{files_signature(source_files(tmx_path))}"
+
+
+def bundle_is_fresh(tmx_path, bundle_dir):
+    try:
+        with open(os.path.join(bundle_dir, "manifest.json")) as file:
+            manifest = json.load(file)
+        return manifest["signature"] == source_signature(tmx_path)
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def compile_level(tmx_path, bundle_dir, level=None):
+    level = level or read_tmx(tmx_path)
+
+    frames = {}
+    for _, surf in level.fences + level.objects:
+        frames.setdefault(id(surf), surf)
+    surfaces = list(frames.values())
+    frame_index = {id(surf): index for index, surf in enumerate(surfaces)}
+    atlas, rects = pack_atlas(surfaces)
+
+    tile_size = level.tile_size
+    columns, rows = level.rect.width // tile_size, level.rect.height // tile_size
+    fences = np.full((rows, columns), -1, dtype=np.int32)
+    for (x, y), surf in level.fences:
+        fences[y // tile_size, x // tile_size] = frame_index[id(surf)]
+
+    names = sorted({name for name, _ in level.entities})
+    arrays = {
+        "atlas": surface_to_array(atlas),
+        "frames": np.array(rects, dtype=np.int32).reshape(-1, 4),
+        "fences": fences,
+        "object_pos": np.array([pos for pos, _ in level.objects], dtype=np.float64).reshape(-1, 2),
+        "object_frame": np.array(
+            [frame_index[id(surf)] for _, surf in level.objects], dtype=np.int32
+        ),
+        "entity_kind": np.array(
+            [names.index(name) for name, _ in level.entities], dtype=np.int32
+        ),
+        "entity_pos": np.array([pos for _, pos in level.entities], dtype=np.float64).reshape(-1, 2),
+    }
+
+    os.makedirs(bundle_dir, exist_ok=True)
+    for name, array in arrays.items():
+        write_atomic(
+            os.path.join(bundle_dir, f"{name}.npy"), lambda file: np.save(file, array), "wb"
+        )
+
+    # the manifest is written last so a half written bundle is never fresh
+    manifest = {
+        "version": BUNDLE_VERSION,
+        "signature": source_signature(tmx_path),
+        "size": list(level.rect.size),
+        "tile_size": tile_size,
+        "entity_names": names,
+    }
+    write_atomic(
+        os.path.join(bundle_dir, "manifest.json"), lambda file: json.dump(manifest, file)
+    )
+
+
+def load_bundle(bundle_dir):
+    with open(os.path.join(bundle_dir, "manifest.json")) as file:
+        manifest = json.load(file)
+
+    def array(name):
+        return np.load(os.path.join(bundle_dir, f"{name}.npy"), mmap_mode="r")
+
+    atlas = array_to_surface(array("atlas")).convert_alpha()
+    surfaces = [atlas.subsurface(rect) for rect in array("frames").tolist()]
+
+    tile_size = manifest["tile_size"]
+    fence_tiles = array("fences")
+    rows, columns = np.nonzero(fence_tiles >= 0)
+    fences = [
+        ((x * tile_size, y * tile_size), surfaces[fence_tiles[y, x]])
+        for y, x in zip(rows.tolist(), columns.tolist())
+    ]
+
+    objects = [
+        (tuple(pos), surfaces[frame])
+        for pos, frame in zip(array("object_pos").tolist(), array("object_frame").tolist())
+    ]
+
+    names = manifest["entity_names"]
+    entities = [
+        (names[kind], tuple(pos))
+        for kind, pos in zip(array("entity_kind").tolist(), array("entity_pos").tolist())
+    ]
+
+    return Level(manifest["size"], tile_size, fences, objects, entities)
+
+
+if __name__ == "__main__":
+    # python level.py [map.tmx]: compile the bundle and report cold start times
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    tmx_path = sys.argv[1] if len(sys.argv) > 1 else "data/map.tmx"
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    start = time.perf_counter()
+    level = read_tmx(tmx_path)
+    tmx_time = time.perf_counter() - start
+
+    bundle_dir = bundle_path(tmx_path, LEVEL_CACHE)
+    compile_level(tmx_path, bundle_dir, level)
+
+    start = time.perf_counter()
+    load_bundle(bundle_dir)
+    bundle_time = time.perf_counter() - start
+
+    print(f"compiled {tmx_path} -> {bundle_dir}")
+    print(f"tmx:    {tmx_time * 1000:.1f} ms")
+    print(f"bundle: {bundle_time * 1000:.1f} ms")
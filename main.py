@@ -1,44 +1,284 @@
-import pygame, sys
+import pygame, sys, os, time
+from math import floor
 from pygame.math import Vector2 as vector
 from settings import *
 from player import Player
-from pytmx.util_pygame import load_pygame
-from sprite import Sprite, Bullet
-from monster import Coffin, Cactus
+from level import load_level
+from sprite import Sprite, BulletPool
+from monster import Monster, Coffin, Cactus, monster_store
+from spatial import ObstacleGroup, SpatialHash
+from scenery import StaticLayer
+from game_clock import game_clock
+from profiler import Profiler, ProfilerOverlay
+from eventlog import event_log, DEBUG, INFO
+from horde import Horde
+from flowfield import FlowField
+from scheduler import AIScheduler
+from audio import audio
+from hud import HUD
+from replay import InputRecorder, InputReplay
 
 
 class AllSprites(pygame.sprite.Group):
-    def __init__(self):
+    def __init__(self, render_scale=1):
         super().__init__()
         self.offset = vector()
         self.display_surface = pygame.display.get_surface()
         self.bg = pygame.image.load("graphics/other/bg.png").convert()
 
+        # draw order is kept between frames and only fixed up, never rebuilt
+        self.draw_order = []
+        self.order_dirty = False
+        self.view = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+
+        # pre-rendered ground and scenery, see bake
+        self.static_layer = None
+        self.use_static_layer = BAKE_STATIC_LAYER
+        self.draw_calls = 0
+
+        # the view is in world pixels, the display in world pixels times this
+        self.render_scale = render_scale
+        self.scaled_images = {}
+
+        # camera and {sprite: (screen rect, image)} of the last frame drawn
+        self.use_dirty_rects = DIRTY_RECTS
+        self.last_frame = None
+
+        self.profiler = None
+        self.update_names = {}
+
+        # per monster time steps for the tick, see scheduler.AIScheduler
+        self.scheduler = None
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.draw_order.append(sprite)
+        # headless runs never sort, so removed and re-added sprites are swept
+        # here as well before the list outgrows the group
+        if len(self.draw_order) > 2 * len(self.spritedict) + 64:
+            self.compact_draw_order()
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.order_dirty = True
+
+    def update(self, dt):
+        steps = self.scheduler.plan(dt) if self.scheduler else {}
+
+        if not (self.profiler and self.profiler.enabled):
+            for sprite in self.sprites():
+                step = steps.get(sprite, dt)
+                if step is not None:
+                    sprite.update(step)
+            return
+
+        # time spent per entity class, shown by the profiler overlay
+        for sprite in self.sprites():
+            step = steps.get(sprite, dt)
+            if step is None:
+                continue
+            start = time.perf_counter()
+            sprite.update(step)
+            cls = type(sprite)
+            if cls not in self.update_names:
+                self.update_names[cls] = f"update:{cls.__name__}"
+            self.profiler.add(self.update_names[cls], (time.perf_counter() - start) * 1000)
+
+    def bake(self, sprites):
+        self.static_layer = StaticLayer(self.bg, sprites, scale=self.render_scale)
+        self.rebuild_draw_order()
+
+    def toggle_static_layer(self):
+        self.use_static_layer = not self.use_static_layer
+        self.rebuild_draw_order()
+
+    def toggle_dirty_rects(self):
+        self.use_dirty_rects = not self.use_dirty_rects
+        self.last_frame = None
+
+    def baking(self):
+        return self.use_static_layer and self.static_layer is not None
+
+    def rebuild_draw_order(self):
+        baked = self.static_layer.rank if self.baking() else {}
+        self.draw_order = [sprite for sprite in self.spritedict if sprite not in baked]
+        self.order_dirty = False
+
     def center_around(self, sprite, window_width, window_height):
         self.offset.x = sprite.rect.centerx - window_width / 2
         self.offset.y = sprite.rect.centery - window_height / 2
+        self.view.update(self.offset.x, self.offset.y, window_width, window_height)
 
-    def customize_draw(self, player, window_width, window_height):
+    def customize_draw(self, player, window_width, window_height, full=False):
+        # returns the screen rects that changed, or None when everything did
         self.center_around(player, window_width, window_height)
+        self.sort_draw_order()
+
+        previous = self.last_frame
+        self.last_frame = None
+        if self.use_dirty_rects and self.baking() and self.render_scale == 1:
+            camera = (self.offset.x, self.offset.y, self.view.size)
+            self.last_frame = (camera, self.snapshot())
+            if not full and previous and previous[0] == camera:
+                return self.blit_dirty(previous[1], self.last_frame[1])
+
+        self.display_surface.fill("black")
         self.blit_surfaces()
+        return None
+
+    def compact_draw_order(self):
+        self.draw_order = list(
+            dict.fromkeys(sprite for sprite in self.draw_order if sprite in self.spritedict)
+        )
+        self.order_dirty = False
+
+    def sort_draw_order(self):
+        if self.order_dirty:
+            self.compact_draw_order()
+
+        # sprites barely move between frames, so the list is almost sorted and
+        # timsort only has to merge a few short runs instead of doing a full sort
+        self.draw_order.sort(key=lambda sprite: sprite.rect.centery)
 
     def blit_surfaces(self):
-        self.display_surface.blit(self.bg, -self.offset)
-        for sprite in sorted(self.sprites(), key=lambda sprite: sprite.rect.centery):
-            offset_rect = sprite.image.get_rect(center=sprite.rect.center)
-            offset_rect.center -= self.offset
-            self.display_surface.blit(sprite.image, offset_rect)
+        self.draw_calls = 0
+        view = self.view.inflate(CULL_MARGIN * 2, CULL_MARGIN * 2)
+
+        if self.baking():
+            self.draw_calls += self.static_layer.draw(
+                self.display_surface, self.offset, self.view
+            )
+            self.blit_actors(view)
+            return
+
+        self.display_surface.blit(self.scaled(self.bg), -self.offset * self.render_scale)
+        self.draw_calls += 1
+        for sprite in self.draw_order:
+            if view.colliderect(sprite.rect):
+                image = self.scaled(sprite.image)
+                offset_rect = image.get_rect(center=(sprite.rect.center - self.offset) * self.render_scale)
+                self.display_surface.blit(image, offset_rect)
+                self.draw_calls += 1
+
+    def scaled(self, image):
+        # frames, flashes and scenery are shared surfaces, so each is scaled once
+        if self.render_scale == 1:
+            return image
+        if image not in self.scaled_images:
+            width, height = image.get_size()
+            size = (max(1, round(width * self.render_scale)), max(1, round(height * self.render_scale)))
+            self.scaled_images[image] = pygame.transform.smoothscale(image, size)
+        return self.scaled_images[image]
+
+    def snapshot(self):
+        view = self.view.inflate(CULL_MARGIN * 2, CULL_MARGIN * 2)
+        frame = {}
+        for sprite in self.draw_order:
+            if view.colliderect(sprite.rect):
+                offset_rect = sprite.image.get_rect(center=sprite.rect.center)
+                offset_rect.center -= self.offset
+                frame[sprite] = (offset_rect, sprite.image)
+        return frame
+
+    def blit_dirty(self, previous, frame):
+        areas = []
+        for sprite, (rect, image) in frame.items():
+            last = previous.get(sprite)
+            if last is None:
+                areas.append(rect)
+            elif last[0] != rect or last[1] is not image:
+                areas.append(rect)
+                areas.append(last[0])
+        for sprite, (rect, _) in previous.items():
+            if sprite not in frame:
+                areas.append(rect)
+
+        self.draw_calls = 0
+        areas = merge_rects(areas, self.display_surface.get_rect())
+        origin_x, origin_y = floor(self.offset.x), floor(self.offset.y)
+        for area in areas:
+            # the same draws as a full frame, clipped to the area that changed
+            self.display_surface.set_clip(area)
+            self.display_surface.fill("black", area)
+            world = area.move(origin_x, origin_y).inflate(2, 2)
+            self.draw_calls += self.static_layer.draw(self.display_surface, self.offset, world)
+            self.blit_actors(world.inflate(CULL_MARGIN * 2, CULL_MARGIN * 2))
+        self.display_surface.set_clip(None)
+        return areas
+
+    def blit_actors(self, view):
+        # actors are drawn over the baked chunks together with the pieces of
+        # scenery that sit in front of them, sorted like the unbaked layer
+        items = []
+        for index, sprite in enumerate(self.draw_order):
+            if not view.colliderect(sprite.rect):
+                continue
+
+            rect = sprite.image.get_rect(center=sprite.rect.center)
+            items.append((sprite.rect.centery, 1, index, sprite, rect, None))
+
+            for occluder, area in self.static_layer.occluders(rect, sprite.rect.centery):
+                rank = self.static_layer.rank[occluder]
+                items.append((occluder.rect.centery, 0, rank, occluder, area, area))
+
+        items.sort(key=lambda item: item[:3])
+
+        scale = self.render_scale
+        origin_x, origin_y = floor(self.offset.x * scale), floor(self.offset.y * scale)
+        for _, _, _, sprite, rect, area in items:
+            image = self.scaled(sprite.image)
+            if area is None:
+                offset_rect = image.get_rect(center=(rect.center - self.offset) * scale)
+                self.display_surface.blit(image, offset_rect)
+            else:
+                # the occluding piece, with its edges rounded like the chunk grid
+                left, top = round(area.left * scale), round(area.top * scale)
+                right, bottom = round(area.right * scale), round(area.bottom * scale)
+                source = pygame.Rect(
+                    left - round(sprite.rect.x * scale),
+                    top - round(sprite.rect.y * scale),
+                    right - left,
+                    bottom - top,
+                )
+                self.display_surface.blit(image, (left - origin_x, top - origin_y), source)
+            self.draw_calls += 1
+
+
+def merge_rects(rects, bounds):
+    # overlapping rects are pushed and redrawn once as their union
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if not rect.width or not rect.height:
+            continue
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, level=None, render_scale=RENDER_SCALE):
+        # headless games run on SDL's dummy drivers: no window, no sound
+        self.headless = headless
+        self.render_scale = min(max(render_scale, 0.5), 1.0)
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+
         pygame.init()
+        audio.configure()
 
         self.WINDOW_WIDTH = 1280
         self.WINDOW_HEIGHT = 720
 
+        # no window to stretch when headless, and tools may already own a plain display
+        flags = pygame.RESIZABLE | (pygame.SCALED if SCALED_DISPLAY and not headless else 0)
         self.display_surface = pygame.display.set_mode(
-            (self.WINDOW_WIDTH, self.WINDOW_HEIGHT), pygame.RESIZABLE
+            (round(self.WINDOW_WIDTH * self.render_scale), round(self.WINDOW_HEIGHT * self.render_scale)),
+            flags,
         )
         pygame.display.set_caption("Western shooter")
 
@@ -47,74 +287,142 @@ class Game:
             "graphics/other/particle.png"
         ).convert_alpha()
 
-        self.all_sprites = AllSprites()
-        self.obstacles = pygame.sprite.Group()
+        self.all_sprites = AllSprites(self.render_scale)
+        self.obstacles = ObstacleGroup()
         self.bullets = pygame.sprite.Group()
         self.monsters = pygame.sprite.Group()
+        self.bullet_grid = SpatialHash(COLLISION_CELL_SIZE)
+
+        self.ticks = 0
+        game_clock.reset()
+
+        # match results, see stats
+        self.death_tick = None
+        self.damage_dealt = 0
+
+        self.profiler = Profiler()
+        self.profiler_overlay = ProfilerOverlay(
+            self.profiler, counters=lambda: {"draw calls": self.all_sprites.draw_calls}
+        )
+        self.hud = HUD(self)
+        self.trace_path = None
+        self.all_sprites.profiler = self.profiler
+
+        # anything returning a key state indexable by pygame key constants
+        self.input_source = pygame.key.get_pressed
+        self.recorder = None
 
-        self.setup()
-        self.music = pygame.mixer.Sound("sound/music.mp3")
-        self.music.play(loops = -1)
+        self.setup(level)
+        if not headless:
+            audio.play_music("sound/music.mp3")
 
     def create_bullet(self, pos, direction):
-        Bullet(pos, direction, self.bullet_surf, [self.all_sprites, self.bullets])
+        self.bullet_pool.spawn(pos, direction)
 
     def bullet_collision(self):
-        # bullet obstacle collision
-        for obstacle in self.obstacles.sprites():
-            pygame.sprite.spritecollide(
-                obstacle, self.bullets, True, pygame.sprite.collide_mask
-            )
+        collide_mask = pygame.sprite.collide_mask
+        bullets = self.bullets.sprites()
+        if not bullets:
+            return
+
+        # broad phase: there are far fewer bullets than monsters, so the bullets
+        # are indexed and every monster looks up the few cells it covers
+        self.bullet_grid.clear()
+        for bullet in bullets:
+            self.bullet_grid.insert(bullet, bullet.rect)
+
+        # a monster no bigger than a cell can only reach a bullet from the cells
+        # around it, the rest are skipped without a lookup
+        size = self.bullet_grid.cell_size
+        near = {
+            (x + dx, y + dy)
+            for x, y in self.bullet_grid.cells
+            for dx in (-1, 0, 1)
+            for dy in (-1, 0, 1)
+        }
+
+        targets = {}
+        for monster in self.monsters.sprites():
+            center = monster.rect.center
+            if (center[0] // size, center[1] // size) not in near:
+                continue
+            for bullet in self.bullet_grid.query(monster.rect):
+                if bullet.rect.colliderect(monster.rect):
+                    targets.setdefault(bullet, []).append(monster)
+
+        for bullet in bullets:
+            # bullet obstacle collision
+            if any(
+                obstacle.rect.colliderect(bullet.rect) and collide_mask(obstacle, bullet)
+                for obstacle in self.obstacles.nearby(bullet.rect)
+            ):
+                bullet.kill()
+                continue
 
-        # bullet monster collision
-        for bullet in self.bullets.sprites():
-            sprites = pygame.sprite.spritecollide(
-                bullet, self.monsters, False, pygame.sprite.collide_mask
-            )
+            # bullet monster collision
+            sprites = [
+                monster for monster in targets.get(bullet, ()) if collide_mask(bullet, monster)
+            ]
 
             if sprites:
                 bullet.kill()
                 for sprite in sprites:
+                    health = sprite.health
                     sprite.damage()
+                    self.damage_dealt += health - sprite.health
 
         # player bullet collision
-        if pygame.sprite.spritecollide(
-            self.player, self.bullets, True, pygame.sprite.collide_mask
-        ):
+        hits = [
+            bullet
+            for bullet in pygame.sprite.spritecollide(self.player, self.bullets, False)
+            if collide_mask(self.player, bullet)
+        ]
+        if hits:
+            for bullet in hits:
+                bullet.kill()
             self.player.damage()
 
-    def setup(self):
-        tmx_map = load_pygame("data/map.tmx")
+    def setup(self, level=None):
+        level = level or load_level("data/map.tmx")
+        # ids and store slots restart per game so runs in the same process stay
+        # comparable and do not keep the monsters of earlier games
+        Monster.instance_counter = 0
+        monster_store.clear()
+        self.level_load_time = level.load_time
+        self.map_rect = level.rect
+        self.bullet_pool = BulletPool(
+            self.bullet_surf, [self.all_sprites, self.bullets], self.map_rect
+        )
 
-        for x, y, surf in tmx_map.get_layer_by_name("Fence").tiles():
-            Sprite((x * 64, y * 64), surf, [self.all_sprites, self.obstacles])
+        for pos, surf in level.fences:
+            Sprite(pos, surf, [self.all_sprites, self.obstacles])
 
-        for obj in tmx_map.get_layer_by_name("Objects"):
-            Sprite((obj.x, obj.y), obj.image, [self.all_sprites, self.obstacles])
+        for pos, surf in level.objects:
+            Sprite(pos, surf, [self.all_sprites, self.obstacles])
 
-        for obj in tmx_map.get_layer_by_name("Entities"):
-            if obj.name == "Player":
+        for name, pos in level.entities:
+            if name == "Player":
                 self.player = Player(
                     game=self,
-                    pos=(obj.x, obj.y),
+                    pos=pos,
                     groups=self.all_sprites,
                     path=PATHS["player"],
                     collision_sprites=self.obstacles,
                     create_bullet=self.create_bullet,
                 )
 
-            if obj.name == "Coffin":
+            if name == "Coffin":
                 Coffin(
-                    pos=(obj.x, obj.y),
+                    pos=pos,
                     groups=[self.all_sprites, self.monsters],
                     path=PATHS["coffin"],
                     collision_sprites=self.obstacles,
                     player=self.player,
                 )
 
-            if obj.name == "Cactus":
+            if name == "Cactus":
                 Cactus(
-                    pos=(obj.x, obj.y),
+                    pos=pos,
                     groups=[self.all_sprites, self.monsters],
                     path=PATHS["cactus"],
                     collision_sprites=self.obstacles,
@@ -122,46 +430,220 @@ class Game:
                     create_bullet=self.create_bullet,
                 )
 
+        self.monsters_spawned = len(self.monsters)
+        self.start_health = self.player.health
+
+        audio.listener = self.player
+
+        self.horde = Horde(self.monsters, self.player)
+        agent_size = (
+            max((monster.hitbox.width for monster in self.monsters), default=0),
+            max((monster.hitbox.height for monster in self.monsters), default=0),
+        )
+        # monsters only steer while chasing, within their walk radius
+        radius = max((monster.walk_radius for monster in self.monsters), default=0)
+        self.flow_field = FlowField(
+            self.map_rect, self.obstacles.sprites(), agent_size, radius=radius
+        )
+        for monster in self.monsters:
+            monster.horde = self.horde
+            monster.flow_field = self.flow_field
+
+        self.scheduler = AIScheduler(self.monsters, self.player)
+        self.all_sprites.scheduler = self.scheduler
+
+        if not self.headless:
+            self.all_sprites.bake(self.obstacles.sprites())
+
+    def trace(self, path):
+        self.trace_path = path
+        self.profiler.start_trace()
+
+    def record(self, path):
+        self.recorder = InputRecorder(path, self.input_source)
+        self.input_source = self.recorder
+
+    def quit(self):
+        if self.trace_path:
+            self.profiler.save_trace(self.trace_path)
+        if self.recorder:
+            self.recorder.close()
+        event_log.close()
+        pygame.quit()
+        sys.exit()
+
     def handle_events(self, event):
         if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
+            self.quit()
+
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+            self.all_sprites.toggle_static_layer()
+
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.profiler_overlay.toggle()
+            # the overlay covers the frame it is drawn on, hiding it has to
+            # repaint all of that and not only what changed under it
+            self.all_sprites.last_frame = None
+
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+            self.all_sprites.toggle_dirty_rects()
 
-        if event.type == pygame.VIDEORESIZE:
-            self.WINDOW_WIDTH = event.w
-            self.WINDOW_HEIGHT = event.h
+        # a scaled display keeps its logical size, SDL stretches it to the window
+        if event.type == pygame.VIDEORESIZE and not SCALED_DISPLAY:
+            self.WINDOW_WIDTH = round(event.w / self.render_scale)
+            self.WINDOW_HEIGHT = round(event.h / self.render_scale)
             self.all_sprites.center_around(
                 self.player, self.WINDOW_WIDTH, self.WINDOW_HEIGHT
             )
             self.all_sprites.customize_draw(
                 self.player, self.WINDOW_WIDTH, self.WINDOW_HEIGHT
             )
+            # nothing of that frame was pushed, the next one has to be full
+            self.all_sprites.last_frame = None
 
     def draw_groups(self):
-        self.display_surface.fill("black")
-        self.all_sprites.customize_draw(
-            self.player, self.WINDOW_WIDTH, self.WINDOW_HEIGHT
+        # the overlay and the death message are translucent and drawn over the
+        # whole frame, so they need full redraws
+        return self.all_sprites.customize_draw(
+            self.player,
+            self.WINDOW_WIDTH,
+            self.WINDOW_HEIGHT,
+            full=self.profiler_overlay.visible or self.player.state_machine.state == "dead",
         )
 
+    def update(self, dt):
+        if self.recorder:
+            dt = self.recorder.sample(dt)
+        game_clock.advance(dt)
+        event_log.tick = self.ticks
+        with self.profiler.section("update"):
+            self.update_sprites(dt)
+        with self.profiler.section("collision"):
+            self.bullet_collision()
+        self.ticks += 1
+
+        if self.death_tick is None and self.player.state_machine.state == "dead":
+            self.death_tick = self.ticks
+
+    def update_sprites(self, dt):
+        self.flow_field.follow(self.player.rect.center)
+        self.all_sprites.update(dt)
+
+    def stats(self):
+        return {
+            "ticks": self.ticks,
+            "survived_ticks": self.ticks if self.death_tick is None else self.death_tick,
+            "player_dead": self.death_tick is not None,
+            "damage_dealt": self.damage_dealt,
+            "damage_taken": self.start_health - self.player.health,
+            "monsters_killed": self.monsters_spawned - len(self.monsters),
+            "monsters_left": len(self.monsters),
+        }
+
+    def replay(self, path):
+        # recorded ticks as fast as they run, drawn too unless headless
+        replay = InputReplay(path)
+        self.input_source = replay
+        start = time.perf_counter()
+        for dt in replay:
+            self.profiler.begin_frame()
+            self.update(dt)
+            if not self.headless:
+                with self.profiler.section("draw"):
+                    self.draw_groups()
+                pygame.display.update()
+            self.profiler.end_frame()
+        return len(replay), time.perf_counter() - start
+
+    def simulate(self, ticks, dt=FIXED_DT):
+        # fixed timestep, no rendering and no frame cap
+        start = time.perf_counter()
+        for _ in range(ticks):
+            self.profiler.begin_frame()
+            self.update(dt)
+            self.profiler.end_frame()
+        return time.perf_counter() - start
+
     def run(self):
-        while True:
-            for event in pygame.event.get():
-                self.handle_events(event)
+        if self.headless:
+            while True:
+                self.simulate(1000)
 
+        while True:
             dt = self.clock.tick(60) / 1000
+            self.profiler.begin_frame()
 
-            self.all_sprites.update(dt)
-            self.bullet_collision()
-            self.draw_groups()
+            with self.profiler.section("events"):
+                for event in pygame.event.get():
+                    self.handle_events(event)
 
-            if self.player.state_machine.state == "dead":
-                self.player.state_machine.state_classes["dead"].display_you_died(
-                    self.display_surface
-                )
+            self.update(dt)
+
+            with self.profiler.section("draw"):
+                dirty = self.draw_groups()
+
+                if self.player.state_machine.state == "dead":
+                    self.player.state_machine.state_classes["dead"].display_you_died(
+                        self.display_surface
+                    )
+
+            if SHOW_HUD:
+                with self.profiler.section("hud"):
+                    hud_rect = self.hud.draw(self.display_surface)
+                    if dirty is not None:
+                        dirty.append(hud_rect)
+
+            if self.profiler_overlay.visible:
+                self.profiler_overlay.draw(self.display_surface)
+
+            with self.profiler.section("display"):
+                if dirty is None:
+                    pygame.display.update()
+                else:
+                    pygame.display.update(dirty)
 
-            pygame.display.update()
+            self.profiler.end_frame()
 
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Western shooter")
+    parser.add_argument("--headless", action="store_true", help="simulate without window or sound")
+    parser.add_argument("--ticks", type=int, help="with --headless, stop after this many ticks")
+    parser.add_argument("--trace", metavar="FILE", help="write a Chrome trace of every frame on exit")
+    parser.add_argument("--event-log", metavar="FILE", help="append state transitions to FILE")
+    parser.add_argument("--debug-events", action="store_true", help="also log transitions into the same state")
+    parser.add_argument("--record", metavar="FILE", help="log input and frame times to FILE for --replay")
+    parser.add_argument("--replay", metavar="FILE", help="re-run a recorded session at full speed and exit")
+    parser.add_argument("--render-scale", type=float, default=RENDER_SCALE, help="draw the world at this fraction of the window size, 0.5 to 1")
+    args = parser.parse_args()
+
+    if args.event_log:
+        event_log.configure(level=DEBUG if args.debug_events else INFO, path=args.event_log)
+
+    game = Game(headless=args.headless, render_scale=args.render_scale)
+    if args.trace:
+        game.trace(args.trace)
+
+    if args.record:
+        game.record(args.record)
+
+    if args.replay:
+        ticks, elapsed = game.replay(args.replay)
+        print(f"replayed {ticks} ticks in {elapsed:.2f}s ({ticks / elapsed:.0f} ticks/s)")
+        if not game.input_source.complete:
+            print("the input log was cut off, replayed up to its last flush")
+        if args.trace:
+            game.profiler.save_trace(args.trace)
+        event_log.close()
+    elif args.headless and args.ticks:
+        elapsed = game.simulate(args.ticks)
+        print(f"{args.ticks} ticks in {elapsed:.2f}s ({args.ticks / elapsed:.0f} ticks/s)")
+        if args.trace:
+            game.profiler.save_trace(args.trace)
+        if game.recorder:
+            game.recorder.close()
+        event_log.close()
+    else:
+        game.run()
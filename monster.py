@@ -1,13 +1,36 @@
-import pygame
 from entity import Entity
+from game_clock import game_clock
+from audio import audio
+from animation import Facing, Action
+from store import EntityStore, StoreField, StorePosition, StoreVector
 from pygame.math import Vector2 as vector
 from states.monster import MonsterStateMachine
 
 
+monster_store = EntityStore(
+    {"x": "d", "y": "d", "speed": "d", "health": "q", "frame_index": "d", "hit_time": "d"}
+)
+
+
 class Monster(Entity):
+    __slots__ = (
+        "slot", "store_pos", "player", "name", "id", "horde", "flow_field", "ai_valid",
+        "player_distance", "player_direction", "ai_facing", "ai_chase",
+        "notice_radius", "walk_radius", "attack_radius",
+    )
     instance_counter = 0
 
+    # hot numeric state lives in monster_store so batched passes can read it
+    # as arrays without touching every sprite
+    pos = StorePosition()
+    speed = StoreField(monster_store, "speed")
+    health = StoreField(monster_store, "health")
+    frame_index = StoreField(monster_store, "frame_index")
+    hit_time = StoreField(monster_store, "hit_time", optional=True)
+
     def __init__(self, pos, groups, path, collision_sprites, player):
+        self.slot = monster_store.alloc()
+        self.store_pos = StoreVector(monster_store, self.slot)
         super().__init__(pos, groups, path, collision_sprites)
         self.state_machine = MonsterStateMachine(self, player)
         self.player = player
@@ -16,7 +39,30 @@ class Monster(Entity):
         Monster.instance_counter += 1
         self.id = Monster.instance_counter
 
+        # filled in by horde.Horde once per tick, valid until this monster moves
+        self.horde = None
+        self.ai_valid = False
+        self.player_distance = 0
+        self.player_direction = vector()
+        self.ai_facing = None
+        self.ai_chase = False
+
+        # shared path to the player, see flowfield.FlowField
+        self.flow_field = None
+
+    def move(self, dt):
+        self.ai_valid = False
+        super().move(dt)
+
+    def kill(self):
+        if self.alive():
+            super().kill()
+            monster_store.release(self.slot)
+
     def get_player_distance_direction(self):
+        if self.ai_valid:
+            return (self.player_distance, self.player_direction)
+
         enemy_pos = vector(self.rect.center)
         player_pos = vector(self.player.rect.center)
         distance = (player_pos - enemy_pos).magnitude()
@@ -29,25 +75,39 @@ class Monster(Entity):
         return (distance, direction)
 
     def face_player(self):
+        if self.horde:
+            self.horde.refresh()
+
+        if self.ai_valid:
+            if self.ai_facing is not None:
+                self.facing = self.ai_facing
+                self.action = Action.IDLE
+            return
+
         distance, direction = self.get_player_distance_direction()
 
         if distance < self.notice_radius:
             if -0.5 < direction.y < 0.5:
                 if direction.x < 0:
-                    self.status = "left_idle"
+                    self.facing, self.action = Facing.LEFT, Action.IDLE
                 elif direction.x > 0:
-                    self.status = "right_idle"
+                    self.facing, self.action = Facing.RIGHT, Action.IDLE
             else:
                 if direction.y < 0:
-                    self.status = "up_idle"
+                    self.facing, self.action = Facing.UP, Action.IDLE
                 elif direction.y > 0:
-                    self.status = "down_idle"
+                    self.facing, self.action = Facing.DOWN, Action.IDLE
 
     def walk_to_player(self):
         distance, direction = self.get_player_distance_direction()
-        if self.attack_radius < distance < self.walk_radius:
-            self.direction = direction
-            self.status = self.status.split("_")[0]
+        if self.ai_valid:
+            chasing = self.ai_chase
+        else:
+            chasing = self.attack_radius < distance < self.walk_radius
+
+        if chasing:
+            self.direction = self.steer(direction)
+            self.action = Action.WALKING
 
             if not self.state_machine.state == "chasing":
                 self.state_machine.chase()
@@ -55,15 +115,24 @@ class Monster(Entity):
         else:
             self.direction = vector(0, 0)
 
+    def steer(self, direction):
+        if self.flow_field:
+            step = self.flow_field.direction(self.rect.center)
+            if step is not None:
+                return step
+        return direction
+
     def damage(self):
         if self.is_vulnerable:
             self.health -= 1
             self.is_vulnerable = False
-            self.hit_time = pygame.time.get_ticks()
-            self.hit_sound.play()
+            self.hit_time = game_clock.get_ticks()
+            audio.play("hit", self.rect.center)
 
 
 class Coffin(Monster):
+    __slots__ = ()
+
     def __init__(self, pos, groups, path, collision_sprites, player):
         super().__init__(pos, groups, path, collision_sprites, player)
         self.speed = 150
@@ -77,11 +146,12 @@ class Coffin(Monster):
             self.player.state_machine.attack()
             self.frame_index = 0
 
-        self.status = f"{self.status.split('_')[0]}_attacking"
+        self.action = Action.ATTACKING
         self.player.state_machine.take_damage()
 
     def animate(self, dt):
-        current_animation = self.animations[self.status]
+        animation = self.animation()
+        current_animation = animation.frames
         self.frame_index += 7 * dt
 
         if int(self.frame_index) == 4 and self.player.state_machine.state == "attacking":
@@ -94,8 +164,7 @@ class Coffin(Monster):
             # if self.attacking:
             #     self.attacking = False
 
-        self.image = current_animation[int(self.frame_index)]
-        self.mask = pygame.mask.from_surface(self.image)
+        self.set_frame(animation, int(self.frame_index))
 
     def update(self, dt):
         self.face_player()
@@ -116,6 +185,8 @@ class Coffin(Monster):
 
 
 class Cactus(Monster):
+    __slots__ = ("create_bullet", "bullet_shot")
+
     def __init__(self, pos, groups, path, collision_sprites, player, create_bullet):
         super().__init__(pos, groups, path, collision_sprites, player)
         self.create_bullet = create_bullet
@@ -131,17 +202,18 @@ class Cactus(Monster):
             self.state_machine.attack()
             self.frame_index = 0
             self.bullet_shot = False
-            self.shoot_sound.play()
+            audio.play("shoot", self.rect.center)
 
         if not self.state_machine.state == "attacking":
-            self.status = self.status.split("_")[0] + "_attacking"
+            self.action = Action.ATTACKING
             self.state_machine.attack()
         else:
             if not self.state_machine.state == "idle":
                 self.state_machine.idle()
 
     def animate(self, dt):
-        current_animation = self.animations[self.status]
+        animation = self.animation()
+        current_animation = animation.frames
 
         if int(self.frame_index) == 6 and self.state_machine.state == "attacking" and not self.bullet_shot:
             _, direction = self.get_player_distance_direction()
@@ -156,8 +228,7 @@ class Cactus(Monster):
             # if self.attacking:
             #     self.attacking = False
 
-        self.image = current_animation[int(self.frame_index)]
-        self.mask = pygame.mask.from_surface(self.image)
+        self.set_frame(animation, int(self.frame_index))
 
     def update(self, dt):
         self.face_player()
@@ -2,10 +2,28 @@ import pygame, sys
 
 from pygame.math import Vector2 as vector
 from entity import Entity
+from audio import audio
+from animation import Facing, Action
 from states.player import PlayerStateMachine
 
+# "damaged" keeps whatever action the hit interrupted
+STATE_ACTIONS = {
+    "idle": Action.IDLE,
+    "walking": Action.WALKING,
+    "attacking": Action.ATTACKING,
+    "dead": Action.DEAD,
+}
+
+BULLET_DIRECTIONS = {
+    Facing.LEFT: vector(-1, 0),
+    Facing.RIGHT: vector(1, 0),
+    Facing.UP: vector(0, -1),
+    Facing.DOWN: vector(0, 1),
+}
 
 class Player(Entity):
+    __slots__ = ("game", "create_bullet", "bullet_shot", "bullet_direction")
+
     def __init__(self, pos, groups, path, collision_sprites, create_bullet, game):
         super().__init__(pos, groups, path, collision_sprites)
         self.game = game
@@ -13,17 +31,19 @@ class Player(Entity):
         self.create_bullet = create_bullet
         self.bullet_shot = False
         self.speed = 250
+        # a cactus attack can put the player in the attacking state before
+        # space was ever pressed
+        self.bullet_direction = BULLET_DIRECTIONS[self.facing]
+
+    def damage(self):
+        self.state_machine.take_damage()
 
     def get_status(self):
         if not self.state_machine.state == "damaged":
-            status_mapping = {
-                "attacking": f"{self.status.split('_')[0]}_attacking",
-                "dead": "dead",
-            }
-            self.status = status_mapping.get(self.state_machine.state, f"{self.status.split('_')[0]}_{self.state_machine.state}")
+            self.action = STATE_ACTIONS[self.state_machine.state]
 
     def input(self):
-        keys = pygame.key.get_pressed()
+        keys = self.game.input_source()
 
         if not self.state_machine.state == "attacking":
             self.state_machine.state_classes[self.state_machine.state].handle_input(
@@ -37,15 +57,7 @@ class Player(Entity):
                 if not self.state_machine.state == "attacking":
                     self.state_machine.attack()
 
-                match self.status.split("_")[0]:
-                    case "left":
-                        self.bullet_direction = vector(-1, 0)
-                    case "right":
-                        self.bullet_direction = vector(1, 0)
-                    case "up":
-                        self.bullet_direction = vector(0, -1)
-                    case "down":
-                        self.bullet_direction = vector(0, 1)
+                self.bullet_direction = BULLET_DIRECTIONS[self.facing]
 
     def update_frame_index(self, dt):
         self.frame_index += 7 * dt
@@ -59,7 +71,7 @@ class Player(Entity):
             bullet_start_pos = self.rect.center + self.bullet_direction * 80
             self.create_bullet(bullet_start_pos, self.bullet_direction)
             self.bullet_shot = True
-            self.shoot_sound.play()
+            audio.play("shoot")
 
     def reset_frame_index(self, current_animation):
         if self.frame_index >= len(current_animation):
@@ -73,22 +85,19 @@ class Player(Entity):
         ):
             self.frame_index = len(current_animation) - 1
 
-    def update_image(self, current_animation):
-        self.image = current_animation[int(self.frame_index)]
-        self.mask = pygame.mask.from_surface(self.image)
+    def update_image(self, animation):
+        self.set_frame(animation, int(self.frame_index))
 
     def update(self, dt):
         self.input()
         self.get_status()
         self.move(dt)
 
-        print(self.status)
-
-        current_animation = self.animations[self.status]
+        animation = self.animation()
         self.update_frame_index(dt)
         self.handle_attack()
-        self.reset_frame_index(current_animation)
-        self.update_image(current_animation)
+        self.reset_frame_index(animation.frames)
+        self.update_image(animation)
 
         self.blink()
         self.check_death()
@@ -0,0 +1,150 @@
+import pygame, json
+from collections import deque
+from time import perf_counter
+
+
+class Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = perf_counter() if self.profiler.enabled else None
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.start is not None:
+            self.profiler.record(self.name, self.start, perf_counter())
+
+
+class Profiler:
+    def __init__(self, history=240):
+        self.enabled = False
+        self.sections = {}
+
+        # one (frame ms, {name: ms}) pair per finished frame
+        self.frames = deque(maxlen=history)
+        self.current = {}
+        self.frame_start = None
+
+        # chrome://tracing events, only kept while tracing
+        self.trace = None
+        self.origin = perf_counter()
+
+    def section(self, name):
+        if name not in self.sections:
+            self.sections[name] = Section(self, name)
+        return self.sections[name]
+
+    def begin_frame(self):
+        self.current = {}
+        self.frame_start = perf_counter() if self.enabled else None
+
+    def end_frame(self):
+        if self.frame_start is not None:
+            self.frames.append(((perf_counter() - self.frame_start) * 1000, self.current))
+            if self.trace is not None:
+                self.trace.append(
+                    {
+                        "name": "entity updates",
+                        "ph": "C",
+                        "ts": self.timestamp(perf_counter()),
+                        "pid": 0,
+                        "args": {
+                            name: ms for name, ms in self.current.items() if name.startswith("update:")
+                        },
+                    }
+                )
+
+    def add(self, name, ms):
+        self.current[name] = self.current.get(name, 0) + ms
+
+    def record(self, name, start, end):
+        self.add(name, (end - start) * 1000)
+        if self.trace is not None:
+            self.trace.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": self.timestamp(start),
+                    "dur": (end - start) * 1e6,
+                    "pid": 0,
+                    "tid": 0,
+                }
+            )
+
+    def timestamp(self, seconds):
+        return (seconds - self.origin) * 1e6
+
+    def top(self, count):
+        totals = {}
+        for _, sections in self.frames:
+            for name, ms in sections.items():
+                totals[name] = totals.get(name, 0) + ms
+
+        frames = max(len(self.frames), 1)
+        averages = [(name, total / frames) for name, total in totals.items()]
+        return sorted(averages, key=lambda item: item[1], reverse=True)[:count]
+
+    def start_trace(self):
+        self.trace = []
+        self.enabled = True
+
+    def save_trace(self, path):
+        with open(path, "w") as file:
+            json.dump({"traceEvents": self.trace or [], "displayTimeUnit": "ms"}, file)
+
+
+class ProfilerOverlay:
+    def __init__(self, profiler, top_count=6, counters=None):
+        self.profiler = profiler
+        # returns {name: value} for the last frame, shown under the timings
+        self.counters = counters or dict
+        self.top_count = top_count
+        self.visible = False
+        self.font = None
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible:
+            self.profiler.enabled = True
+        elif self.profiler.trace is None:
+            self.profiler.enabled = False
+
+    def draw(self, surface):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+
+        counters = self.counters()
+        history = self.profiler.frames.maxlen
+        graph = pygame.Rect(10, 10, history, 60)
+        panel = graph.inflate(10, 10 + 18 * (self.top_count + 1 + len(counters)))
+        panel.topleft = (5, 5)
+
+        background = pygame.Surface(panel.size, pygame.SRCALPHA)
+        background.fill((0, 0, 0, 170))
+        surface.blit(background, panel)
+
+        # bars scaled so the top of the graph is two 60 FPS frames
+        scale = graph.height / 33.3
+        for x, (frame_ms, _) in enumerate(self.profiler.frames):
+            height = min(graph.height, int(frame_ms * scale))
+            colour = (80, 220, 80) if frame_ms <= 16.7 else (230, 70, 60)
+            pygame.draw.line(
+                surface, colour, (graph.left + x, graph.bottom), (graph.left + x, graph.bottom - height)
+            )
+        budget = graph.bottom - int(16.7 * scale)
+        pygame.draw.line(surface, (200, 200, 200), (graph.left, budget), (graph.right, budget))
+
+        frames = self.profiler.frames
+        average = sum(frame_ms for frame_ms, _ in frames) / max(len(frames), 1)
+        lines = [f"frame {average:.2f} ms"]
+        lines += [f"{name} {ms:.2f} ms" for name, ms in self.profiler.top(self.top_count)]
+        lines += [f"{name} {value}" for name, value in counters.items()]
+
+        for index, line in enumerate(lines):
+            text = self.font.render(line, True, (255, 255, 255))
+            surface.blit(text, (graph.left, graph.bottom + 6 + index * 18))
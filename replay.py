@@ -0,0 +1,112 @@
+import gzip, struct, zlib
+import pygame
+
+MAGIC = b"WWIN"
+VERSION = 1
+
+# one record per tick: held keys as a bitfield and dt in 1/60000 s, which is
+# exact for both the whole milliseconds of a live clock and 1/60 fixed steps
+RECORD = struct.Struct("<BI")
+DT_UNITS = 60000
+# a crashed or killed session keeps everything up to the last flush
+FLUSH_TICKS = 60
+
+KEY_BITS = (pygame.K_RIGHT, pygame.K_LEFT, pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE)
+KEY_INDEX = {key: index for index, key in enumerate(KEY_BITS)}
+# set when anything else is held, the walking state checks any(keys)
+OTHER_KEY = 1 << len(KEY_BITS)
+
+
+class KeyState:
+    # stands in for pygame.key.get_pressed()
+    __slots__ = ("bits",)
+
+    def __init__(self, bits):
+        self.bits = bits
+
+    def __getitem__(self, key):
+        index = KEY_INDEX.get(key)
+        return index is not None and bool(self.bits >> index & 1)
+
+    def __iter__(self):
+        return (bool(self.bits >> index & 1) for index in range(len(KEY_BITS) + 1))
+
+
+KEY_STATES = [KeyState(bits) for bits in range(OTHER_KEY << 1)]
+
+
+def held(keys):
+    # the key state with exactly these keys down
+    bits = 0
+    for key in keys:
+        bits |= 1 << KEY_INDEX[key]
+    return KEY_STATES[bits]
+
+
+def encode(pressed):
+    bits = 0
+    for index, key in enumerate(KEY_BITS):
+        if pressed[key]:
+            bits |= 1 << index
+    if sum(pressed) > bits.bit_count():
+        bits |= OTHER_KEY
+    return bits
+
+
+class InputRecorder:
+    # the game reads its keys through the recorder, so a live run sees exactly
+    # what its replay will
+    def __init__(self, path, source=pygame.key.get_pressed):
+        self.source = source
+        self.file = gzip.open(path, "wb")
+        self.file.write(MAGIC + bytes([VERSION]))
+        self.keys = KEY_STATES[0]
+        self.ticks = 0
+
+    def sample(self, dt):
+        # returns dt rounded to what the log can hold, the game steps with that
+        self.keys = KEY_STATES[encode(self.source())]
+        units = round(dt * DT_UNITS)
+        self.file.write(RECORD.pack(self.keys.bits, units))
+        self.ticks += 1
+        if self.ticks % FLUSH_TICKS == 0:
+            self.file.flush(zlib.Z_SYNC_FLUSH)
+        return units / DT_UNITS
+
+    def __call__(self):
+        return self.keys
+
+    def close(self):
+        self.file.close()
+
+
+class InputReplay:
+    def __init__(self, path):
+        # decompressed by hand so a log that was never closed still reads up
+        # to its last flush instead of failing on the missing end of stream
+        with open(path, "rb") as file:
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            data = decompressor.decompress(file.read())
+        self.complete = decompressor.eof
+
+        header = MAGIC + bytes([VERSION])
+        if not data.startswith(header):
+            raise ValueError(f"{path} is not a version {VERSION} input log")
+
+        # a cut off log can end inside a record, that tick is dropped
+        body = data[len(header) :]
+        body = body[: len(body) - len(body) % RECORD.size]
+        self.records = list(RECORD.iter_unpack(body))
+        self.keys = KEY_STATES[0]
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        # yields the dt of every tick and switches the keys to that tick's
+        for bits, units in self.records:
+            self.keys = KEY_STATES[bits]
+            yield units / DT_UNITS
+
+    def __call__(self):
+        return self.keys
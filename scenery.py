@@ -0,0 +1,72 @@
+import pygame
+from math import floor
+from settings import *
+from spatial import SpatialHash
+
+
+class StaticLayer:
+    def __init__(self, bg, sprites, chunk_size=CHUNK_SIZE, scale=1):
+        self.chunk_size = chunk_size
+        self.scale = scale
+        self.sprites = sorted(sprites, key=lambda sprite: sprite.rect.centery)
+        self.rank = {sprite: index for index, sprite in enumerate(self.sprites)}
+
+        # finer index used to find the scenery that has to be drawn over actors
+        self.grid = SpatialHash()
+        for sprite in self.sprites:
+            self.grid.insert(sprite, sprite.rect)
+
+        self.chunks = {}
+        self.bake(bg)
+
+    def bake(self, bg):
+        area = bg.get_rect()
+        for sprite in self.sprites:
+            area.union_ip(sprite.rect)
+
+        size = self.chunk_size
+        for x in range(area.left // size, (area.right - 1) // size + 1):
+            for y in range(area.top // size, (area.bottom - 1) // size + 1):
+                chunk_rect = pygame.Rect(x * size, y * size, size, size)
+                chunk = pygame.Surface(chunk_rect.size).convert()
+                chunk.fill("black")
+                chunk.blit(bg, (-chunk_rect.x, -chunk_rect.y))
+
+                # sprites are already in y order, so overlapping scenery bakes like it draws
+                for sprite in self.sprites:
+                    if chunk_rect.colliderect(sprite.rect):
+                        chunk.blit(sprite.image, sprite.rect.move(-chunk_rect.x, -chunk_rect.y))
+
+                if self.scale != 1:
+                    chunk, chunk_rect = self.scale_chunk(chunk, x, y)
+                self.chunks[(x, y)] = (chunk, chunk_rect)
+
+    def scale_chunk(self, chunk, x, y):
+        # edges are rounded from the world grid so neighbouring chunks never leave a gap
+        size, scale = self.chunk_size, self.scale
+        left, top = round(x * size * scale), round(y * size * scale)
+        right, bottom = round((x + 1) * size * scale), round((y + 1) * size * scale)
+        rect = pygame.Rect(left, top, right - left, bottom - top)
+        return pygame.transform.smoothscale(chunk, rect.size), rect
+
+    def draw(self, surface, offset, view):
+        # floor keeps chunk seams on the same pixel the big background used to land on
+        origin_x, origin_y = floor(offset.x * self.scale), floor(offset.y * self.scale)
+        size = self.chunk_size
+        calls = 0
+
+        for x in range(view.left // size, (view.right - 1) // size + 1):
+            for y in range(view.top // size, (view.bottom - 1) // size + 1):
+                if (x, y) in self.chunks:
+                    chunk, chunk_rect = self.chunks[(x, y)]
+                    surface.blit(chunk, (chunk_rect.x - origin_x, chunk_rect.y - origin_y))
+                    calls += 1
+
+        return calls
+
+    def occluders(self, rect, centery):
+        # scenery lower on screen than the actor has to be redrawn over it, but
+        # only inside the actor's rect, the chunk already holds the rest
+        for sprite in self.grid.query(rect):
+            if sprite.rect.centery > centery and sprite.rect.colliderect(rect):
+                yield sprite, rect.clip(sprite.rect)
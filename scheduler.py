@@ -0,0 +1,91 @@
+import numpy as np
+import pygame
+from settings import *
+from monster import monster_store
+
+ACTIVE, NEAR, FAR = range(3)
+TIER_NAMES = ("active", "near", "far")
+TIER_INTERVALS = np.array([1, AI_NEAR_INTERVAL, AI_FAR_INTERVAL])
+
+
+class AIScheduler:
+    # monsters the player can see or that could notice the player update every
+    # tick, the rest every few ticks with the time they missed added up
+    def __init__(self, monsters, player):
+        self.monsters = monsters
+        self.player = player
+        # the screen as the camera frames it around the player, kept apart from
+        # the renderer so headless runs and replays pick the same tiers
+        self.view = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+        self.members = []
+        self.tick = 0
+
+        self.tier_counts = [0, 0, 0]
+        self.skipped = [0, 0, 0]
+        self.updated = 0
+
+    def rebuild(self, members):
+        pending = dict(zip(self.members, self.pending.tolist())) if self.members else {}
+        self.members = members
+        self.slots = np.array([monster.slot for monster in members], dtype=np.intp)
+        self.active_radius = np.array(
+            [monster.notice_radius + AI_ACTIVE_MARGIN for monster in members], dtype=float
+        )
+        # spread the slow tiers over the ticks instead of waking them together
+        self.phase = np.array([monster.id for monster in members])
+        self.pending = np.array([pending.get(monster, 0.0) for monster in members], dtype=float)
+
+    def plan(self, dt):
+        # {monster: dt} for the monsters that are not on the every tick tier,
+        # None when a monster sits this tick out
+        members = self.monsters.sprites()
+        if members != self.members:
+            self.rebuild(members)
+        self.tick += 1
+        if not members:
+            self.tier_counts = [0, 0, 0]
+            return {}
+
+        xs = monster_store.view("x")[self.slots]
+        ys = monster_store.view("y")[self.slots]
+        player_x, player_y = self.player.rect.center
+        distance = np.hypot(xs - player_x, ys - player_y)
+
+        view = self.view
+        view.center = self.player.rect.center
+        visible = (
+            (xs >= view.left - CULL_MARGIN)
+            & (xs <= view.right + CULL_MARGIN)
+            & (ys >= view.top - CULL_MARGIN)
+            & (ys <= view.bottom + CULL_MARGIN)
+        )
+
+        tier = np.where(distance < AI_NEAR_RANGE, NEAR, FAR)
+        tier[visible | (distance < self.active_radius)] = ACTIVE
+
+        self.pending += dt
+        due = (self.tick + self.phase) % TIER_INTERVALS[tier] == 0
+        steps = self.pending.tolist()
+        self.pending[due] = 0
+
+        counts = np.bincount(tier, minlength=3)
+        missed = np.bincount(tier[~due], minlength=3)
+        self.tier_counts = counts.tolist()
+        for index, count in enumerate(missed.tolist()):
+            self.skipped[index] += count
+        self.updated = int(due.sum())
+
+        return {
+            monster: step if is_due else None
+            for monster, step, is_due, is_active in zip(
+                members, steps, due.tolist(), (tier == ACTIVE).tolist()
+            )
+            if not is_active
+        }
+
+    def stats(self):
+        return {
+            "tiers": dict(zip(TIER_NAMES, self.tier_counts)),
+            "updated": self.updated,
+            "skipped": dict(zip(TIER_NAMES[1:], self.skipped[1:])),
+        }
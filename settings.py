@@ -1,4 +1,56 @@
 WINDOW_WIDTH, WINDOW_HEIGHT = 1280, 720
+TILE_SIZE = 64
+
+# the world is always drawn at the window size above and SDL scales it to the
+# real window, RENDER_SCALE (0.5 - 1.0) draws it at fewer pixels than that
+SCALED_DISPLAY = True
+RENDER_SCALE = 1.0
+
+# seconds simulated per tick in headless mode
+FIXED_DT = 1 / 60
+
+# sprites whose rect is further than this outside the window are not drawn
+CULL_MARGIN = 128
+# bullet grid cells, no smaller than the largest monster so a lookup touches at most 4
+COLLISION_CELL_SIZE = 256
+
+# static scenery is pre-rendered into chunks of this many pixels
+BAKE_STATIC_LAYER = True
+CHUNK_SIZE = 512
+
+# with the static layer baked and the camera still, only redraw and push the
+# screen areas of sprites that moved or changed frame
+DIRTY_RECTS = True
+
+# compiled level bundles, rebuilt whenever the .tmx or its tilesets change
+LEVEL_CACHE = "data/cache"
+ATLAS_CACHE = "data/cache/atlas"
+
+# monsters off screen and further than their notice radius plus this margin
+# update every few ticks, and rarely beyond the near range
+AI_ACTIVE_MARGIN = 200
+AI_NEAR_RANGE = 2000
+AI_NEAR_INTERVAL = 4
+AI_FAR_INTERVAL = 30
+
+# bullets expire after this many seconds or pixels travelled
+BULLET_LIFETIME = 4
+BULLET_RANGE = 1200
+
+# health, monster count and FPS in the top right corner
+SHOW_HUD = True
+HUD_FONT_SIZE = 28
+
+# effects share this many mixer channels, are quieter with distance from the
+# player and not played at all beyond AUDIO_RANGE pixels
+AUDIO_CHANNELS = 8
+AUDIO_RANGE = 1000
+
+# voices: how many copies may play at once, priority: higher cuts off lower
+SOUNDS = {
+    "hit": {"path": "sound/hit.mp3", "volume": 0.1, "voices": 3, "priority": 2},
+    "shoot": {"path": "sound/bullet.wav", "volume": 0.1, "voices": 4, "priority": 1},
+}
 
 PATHS = {
     "player": "graphics/player",
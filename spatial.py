@@ -0,0 +1,65 @@
+import pygame
+from settings import *
+
+
+class SpatialHash:
+    def __init__(self, cell_size=TILE_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        columns = range(rect.left // size, (rect.right - 1) // size + 1)
+        rows = range(rect.top // size, (rect.bottom - 1) // size + 1)
+        return columns, rows
+
+    def insert(self, item, rect):
+        columns, rows = self.cell_range(rect)
+        for x in columns:
+            for y in rows:
+                self.cells.setdefault((x, y), []).append(item)
+
+    def clear(self):
+        self.cells.clear()
+
+    def query(self, rect):
+        found = {}
+        columns, rows = self.cell_range(rect)
+        for x in columns:
+            for y in rows:
+                for item in self.cells.get((x, y), ()):
+                    found[item] = None
+        return found
+
+
+class ObstacleGroup(pygame.sprite.Group):
+    # obstacles never move after Game.setup, so the index is built once and
+    # only rebuilt if sprites are added or removed later
+    def __init__(self, *sprites, cell_size=TILE_SIZE):
+        self.grid = SpatialHash(cell_size)
+        self.order = {}
+        self.dirty = True
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.dirty = True
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.dirty = True
+
+    def rebuild(self):
+        self.grid.clear()
+        self.order = {}
+        for index, sprite in enumerate(self.sprites()):
+            self.order[sprite] = index
+            self.grid.insert(sprite, sprite.rect)
+        self.dirty = False
+
+    def nearby(self, rect):
+        if self.dirty:
+            self.rebuild()
+
+        # keep group order so collisions resolve exactly like a full scan
+        return sorted(self.grid.query(rect), key=self.order.__getitem__)
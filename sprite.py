@@ -1,26 +1,87 @@
 import pygame
+from settings import *
 
 
 class Sprite(pygame.sprite.Sprite):
+    __slots__ = ("image", "rect", "hitbox", "mask")
+
     def __init__(self, pos, surf, groups):
         super().__init__(groups)
         self.image = surf
         self.rect = self.image.get_rect(topleft=pos)
         self.hitbox = self.rect.inflate(0, -self.rect.height / 3)
+        self.mask = pygame.mask.from_surface(self.image)
 
 
 class Bullet(pygame.sprite.Sprite):
-    def __init__(self, pos, direction, surf, groups):
-        super().__init__(groups)
+    __slots__ = (
+        "image", "mask", "bounds", "pool", "pos", "start_pos", "direction",
+        "speed", "rect", "age",
+    )
+
+    def __init__(self, pos, direction, surf, groups, bounds=None, pool=None):
+        super().__init__()
         self.image = surf
-        self.mask = pygame.mask.from_surface(self.image)
-        self.rect = self.image.get_rect(center=pos)
+        self.mask = pool.mask if pool else pygame.mask.from_surface(self.image)
+        self.bounds = bounds
+        self.pool = pool
 
         # float based movement
-        self.pos = pygame.math.Vector2(self.rect.center)
-        self.direction = direction
+        self.pos = pygame.math.Vector2()
+        self.start_pos = pygame.math.Vector2()
+        self.direction = pygame.math.Vector2()
         self.speed = 400
 
+        self.reset(pos, direction, groups)
+
+    def reset(self, pos, direction, groups):
+        self.rect = self.image.get_rect(center=pos)
+        self.pos.update(self.rect.center)
+        self.start_pos.update(self.pos)
+        self.direction.update(direction)
+        self.age = 0
+        self.add(groups)
+
+    def expired(self):
+        if self.age > BULLET_LIFETIME:
+            return True
+        if self.pos.distance_squared_to(self.start_pos) > BULLET_RANGE**2:
+            return True
+        return self.bounds is not None and not self.bounds.collidepoint(self.pos)
+
+    def kill(self):
+        if self.alive():
+            super().kill()
+            if self.pool:
+                self.pool.release(self)
+
     def update(self, dt):
-        self.pos += self.direction * self.speed * dt
+        self.pos.x += self.direction.x * self.speed * dt
+        self.pos.y += self.direction.y * self.speed * dt
         self.rect.center = (round(self.pos.x), round(self.pos.y))
+
+        self.age += dt
+        if self.expired():
+            self.kill()
+
+
+class BulletPool:
+    def __init__(self, surf, groups, bounds=None):
+        self.surf = surf
+        self.mask = pygame.mask.from_surface(surf)
+        self.groups = groups
+        self.bounds = bounds
+        self.free = []
+        self.created = 0
+
+    def spawn(self, pos, direction):
+        if self.free:
+            bullet = self.free.pop()
+            bullet.reset(pos, direction, self.groups)
+        else:
+            bullet = Bullet(pos, direction, self.surf, self.groups, self.bounds, self)
+            self.created += 1
+        return bullet
+
+    def release(self, bullet):
+        self.free.append(bullet)
@@ -0,0 +1,59 @@
+from eventlog import event_log
+
+
+class MachineSpec:
+    # one shared transition table per entity class; every trigger can fire
+    # from any state, like the '*' transitions this replaced
+    def __init__(self, states, triggers, initial, reentrant=()):
+        self.names = tuple(states)
+        self.ids = {name: index for index, name in enumerate(self.names)}
+        self.triggers = {trigger: self.ids[target] for trigger, target in triggers}
+        self.initial = self.ids[initial]
+
+        # states whose on_enter must run again when triggered from themselves
+        self.reentrant = frozenset(self.ids[name] for name in reentrant)
+
+
+class StateMachine:
+    spec = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for trigger, target in cls.spec.triggers.items():
+            setattr(cls, trigger, make_trigger(target))
+
+    def __init__(self, state_classes):
+        self.state_classes = state_classes
+        self.on_enter = [getattr(state_classes[name], "on_enter", None) for name in self.spec.names]
+        self.on_exit = [getattr(state_classes[name], "on_exit", None) for name in self.spec.names]
+        self.state_id = self.spec.initial
+        self.previous_state = None
+
+    @property
+    def state(self):
+        return self.spec.names[self.state_id]
+
+    def label(self):
+        return type(self).__name__
+
+    def transition(self, target):
+        source = self.state_id
+        if source == target and target not in self.spec.reentrant:
+            return
+
+        if self.on_exit[source]:
+            self.on_exit[source]()
+        self.state_id = target
+        if self.on_enter[target]:
+            self.on_enter[target]()
+
+        self.previous_state = self.spec.names[source]
+        if event_log.enabled:
+            event_log.transition(self.label(), self.previous_state, self.state)
+
+
+def make_trigger(target):
+    def trigger(self):
+        self.transition(target)
+
+    return trigger
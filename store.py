@@ -0,0 +1,101 @@
+import numpy as np
+from array import array
+
+
+class EntityStore:
+    # structure of arrays: one contiguous column per hot numeric field,
+    # indexed by the slot each entity gets when it is created
+    def __init__(self, fields):
+        self.columns = {name: array(typecode) for name, typecode in fields.items()}
+        self.free = []
+        self.size = 0
+
+    def alloc(self):
+        if self.free:
+            return self.free.pop()
+
+        for column in self.columns.values():
+            column.append(0)
+        self.size += 1
+        return self.size - 1
+
+    def release(self, slot):
+        self.free.append(slot)
+
+    def clear(self):
+        # in place, the field descriptors hold on to the columns
+        for column in self.columns.values():
+            del column[:]
+        self.free.clear()
+        self.size = 0
+
+    def view(self, name):
+        # zero copy numpy view, do not keep it across alloc calls
+        column = self.columns[name]
+        return np.frombuffer(column, dtype=column.typecode)
+
+    def __len__(self):
+        return self.size - len(self.free)
+
+
+class StoreField:
+    # an attribute that lives in a store column instead of on the instance
+    def __init__(self, store, name, optional=False):
+        self.column = store.columns[name]
+        self.optional = optional
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = self.column[instance.slot]
+        if self.optional and value != value:
+            return None
+        return value
+
+    def __set__(self, instance, value):
+        if value is None and self.optional:
+            value = float("nan")
+        self.column[instance.slot] = value
+
+
+class StoreVector:
+    __slots__ = ("xs", "ys", "slot")
+
+    def __init__(self, store, slot):
+        self.xs = store.columns["x"]
+        self.ys = store.columns["y"]
+        self.slot = slot
+
+    @property
+    def x(self):
+        return self.xs[self.slot]
+
+    @x.setter
+    def x(self, value):
+        self.xs[self.slot] = value
+
+    @property
+    def y(self):
+        return self.ys[self.slot]
+
+    @y.setter
+    def y(self, value):
+        self.ys[self.slot] = value
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+
+    def __repr__(self):
+        return f"StoreVector({self.x}, {self.y})"
+
+
+class StorePosition:
+    # pos backed by the x and y columns, assigning copies the coordinates
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.store_pos
+
+    def __set__(self, instance, value):
+        instance.store_pos.x, instance.store_pos.y = value